@@ -1,24 +1,358 @@
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
+import bisect
+import collections
+import contextlib
+import functools
+import heapq
+import itertools
+import operator
+import os
+import re
+import struct
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+# The Time_Set file header: magic, version, normalized flag, number of time
+# intervals, time unit and timezone name, padded to a multiple of 8 bytes.
+_FILE_HEADER = struct.Struct("<8sIIQ8s48s")
+_FILE_MAGIC = b"TIMESET\0"
+_FILE_VERSION = 1
+
+# tz-aware times are held in UTC and built by adding to this epoch.
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _cached_result(method):
+    """Caches what a Time_Set method returns in the Time_Set's _cache.
+
+    Time_Sets are immutable values, so a derived result, once computed,
+    stays valid for the life of the Time_Set.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return self._cache[method.__name__]
+        except KeyError:
+            result = self._cache[method.__name__] = method(self, *args, **kwargs)
+            return result
+
+    return wrapper
+
 
 class Time_Set:
-    """A collection of zero or more time intervals."""
+    """A collection of zero or more time intervals.
+
+    A Time_Set is an immutable value: append() and the set operators return
+    new Time_Sets, and its time intervals must not be changed in place. This
+    lets a Time_Set be hashed, and lets it compute derived results such as
+    its union, its total duration and its query index once, on first use.
+
+    Time intervals are either all naive or all tz-aware. tz-aware times are
+    converted to UTC once, when they are ingested, so every comparison and
+    merge runs on UTC times whatever zones they were recorded in; methods
+    such as to_dataframe() and coverage() render results back in a given
+    timezone.
+    """
 
     def __init__(self, time_intervals: list):
         """Constructs a Time_Set from Time_Interval objects."""
         self.validate_list_of_time_intervals(time_intervals)
         self.time_intervals = sorted(time_intervals)
+        self.is_normalized = False
+        self._cache = {}
+
+    @classmethod
+    def _from_normalized(cls, time_intervals: list):
+        """Wraps a list that is already sorted, disjoint and merged.
+
+        Skips validation and sorting; only for internal results such as
+        compute_union() that are normalized by construction.
+        """
+        time_set = Time_Set._from_sorted(time_intervals)
+        time_set.is_normalized = True
+        return time_set
+
+    @classmethod
+    def _from_sorted(cls, time_intervals: list):
+        """Wraps a list of valid Time_Intervals that is already sorted."""
+        time_set = Time_Set.__new__(Time_Set)
+        time_set.time_intervals = time_intervals
+        time_set.is_normalized = False
+        time_set._cache = {}
+        return time_set
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        dataframe: pd.core.frame.DataFrame,
+        start_column: str = "start",
+        end_column: str = "end",
+        time_format: str = None,
+        errors: str = "raise",
+        tz=None,
+    ):
+        """Constructs a Time_Set from a pandas dataframe.
+
+        String columns are parsed in bulk and the whole frame is validated at
+        once, rather than row by row through Time_Interval.from_strings().
+
+        Parameters:
+            dataframe : pd.DataFrame - one row per time interval.
+            start_column : str - the column holding start times.
+            end_column : str - the column holding end times.
+            time_format : str - the format of string columns, inferred if None.
+            errors : str - "raise" to raise one ValueError listing every bad row,
+                or "drop" to warn about the bad rows and skip them.
+            tz : str or tzinfo - the timezone of naive times, which are then
+                converted to UTC in bulk. Times that do not exist or are
+                ambiguous in that timezone, around DST changes, are bad rows.
+                tz-aware columns are always converted to UTC.
+        """
+        starts, ends, utc = _dataframe_to_arrays(
+            dataframe, start_column, end_column, time_format, errors, tz
+        )
+        return cls(_time_intervals_from_arrays(starts, ends, utc))
+
+    @classmethod
+    def from_string_pairs(
+        cls, starts: list, ends: list, time_format: str = "%m/%d/%Y %H:%M", tz=None
+    ):
+        """Constructs a Time_Set from lists of start and end time strings.
+
+        See Time_Interval.from_string_pairs(). If tz is given, the times are
+        local times in that timezone, converted to UTC in bulk as by
+        from_dataframe().
+        """
+        if tz is not None:
+            if len(starts) != len(ends):
+                raise ValueError("There must be exactly one end time per start time.")
+            parse = _compile_time_format(time_format)
+            dataframe = pd.DataFrame(
+                {
+                    "start": [parse(start) for start in starts],
+                    "end": [parse(end) for end in ends],
+                }
+            )
+            return Time_Set.from_dataframe(dataframe, tz=tz)
+        time_intervals = Time_Interval.from_string_pairs(starts, ends, time_format)
+        return Time_Set._from_sorted(sorted(time_intervals))
+
+    @staticmethod
+    def group_union(
+        dataframe: pd.core.frame.DataFrame,
+        by: str,
+        start_column: str = "start",
+        end_column: str = "end",
+        time_format: str = None,
+        errors: str = "raise",
+        tz=None,
+    ) -> dict:
+        """Computes the union of the time intervals of every group at once.
+
+        Rather than building one Time_Set per group, the rows are sorted once
+        by group and start time, and a running maximum of the end times that
+        restarts at each group finds every merged block of every group in a
+        single vectorized pass.
+
+        Parameters:
+            dataframe : pd.DataFrame - one row per time interval.
+            by : str - the column holding each row's group, such as an entity id.
+            start_column, end_column, time_format, errors, tz : see from_dataframe().
+
+        Returns:
+            dict - a normalized Array_Time_Set per group key.
+        """
+        starts, ends, utc, kept = _dataframe_to_arrays_and_mask(
+            dataframe, start_column, end_column, time_format, errors, tz
+        )
+        codes, keys = _group_codes(dataframe, by, kept)
+        if len(keys) == 0:
+            return {}
+        order = np.lexsort((starts, codes))
+        starts, ends, codes = starts[order], ends[order], codes[order]
+
+        latest_ends = (
+            pd.Series(ends.view(np.int64)).groupby(codes).cummax().to_numpy()
+        ).view("datetime64[ns]")
+        new_block = np.ones(len(starts), dtype=bool)
+        new_block[1:] = (codes[1:] != codes[:-1]) | (starts[1:] > latest_ends[:-1])
+        block_starts = np.flatnonzero(new_block)
+        block_ends = np.append(block_starts[1:], len(starts)) - 1
+
+        union_starts, union_ends = starts[block_starts], latest_ends[block_ends]
+        group_bounds = np.searchsorted(codes[block_starts], np.arange(len(keys) + 1))
+        return {
+            key: Array_Time_Set._from_normalized(
+                union_starts[lo:hi], union_ends[lo:hi], utc
+            )
+            for key, lo, hi in zip(keys, group_bounds[:-1], group_bounds[1:])
+        }
+
+    @staticmethod
+    def group_intersection(
+        dataframe: pd.core.frame.DataFrame,
+        by: str,
+        start_column: str = "start",
+        end_column: str = "end",
+        time_format: str = None,
+        errors: str = "raise",
+        tz=None,
+    ) -> dict:
+        """Computes the intersection of the time intervals of every group at once.
+
+        Takes the same parameters as group_union(). The intersection of a
+        group is its latest start to its earliest end, found for every group
+        with one sort and two vectorized reductions.
+
+        Returns:
+            dict - a Time_Interval, or None if it is empty, per group key.
+        """
+        starts, ends, utc, kept = _dataframe_to_arrays_and_mask(
+            dataframe, start_column, end_column, time_format, errors, tz
+        )
+        codes, keys = _group_codes(dataframe, by, kept)
+        if len(keys) == 0:
+            return {}
+        order = np.argsort(codes, kind="stable")
+        group_starts = np.flatnonzero(np.diff(codes[order], prepend=-1))
+
+        latest_starts = np.maximum.reduceat(starts[order], group_starts)
+        earliest_ends = np.minimum.reduceat(ends[order], group_starts)
+        return {
+            key: (Time_Interval._unchecked(start, end) if start < end else None)
+            for key, start, end in zip(
+                keys,
+                _datetimes_from_array(latest_starts, utc),
+                _datetimes_from_array(earliest_ends, utc),
+            )
+        }
+
+    def to_dataframe(
+        self, start_column: str = "start", end_column: str = "end", tz=None
+    ):
+        """Returns the time intervals as a dataframe with start and end columns.
+
+        The columns of a tz-aware Time_Set are in UTC, or in tz if given.
+        """
+        tz = self._output_tz(tz)
+        starts, ends = self._as_arrays()
+        if tz is not None:
+            starts = pd.DatetimeIndex(starts).tz_localize("UTC").tz_convert(tz)
+            ends = pd.DatetimeIndex(ends).tz_localize("UTC").tz_convert(tz)
+        return pd.DataFrame({start_column: starts, end_column: ends})
+
+    def save(self, path: str):
+        """Saves the Time_Set to a binary file that load() can memory-map.
+
+        The file is a small header recording the unit, the timezone and
+        whether the set is normalized, followed by the sorted start times and
+        then the end times as little-endian int64 nanoseconds. The timezone is
+        "UTC" for a tz-aware Time_Set, and empty for a naive one.
+        """
+        starts, ends = self._as_arrays()
+        # copied out before the file is truncated, since they may be mapped from it.
+        starts = starts.view(np.int64).astype("<i8").tobytes()
+        ends = ends.view(np.int64).astype("<i8").tobytes()
+        with open(path, "wb") as file:
+            file.write(
+                _FILE_HEADER.pack(
+                    _FILE_MAGIC,
+                    _FILE_VERSION,
+                    int(self.is_normalized),
+                    len(self),
+                    b"ns",
+                    b"UTC" if self.is_utc else b"",
+                )
+            )
+            file.write(starts)
+            file.write(ends)
 
     @classmethod
-    def from_dataframe(cls, dataframe: pd.core.frame.DataFrame):
-        """Constructs a Time_Set from a pandas dataframe."""
-        pass
+    def load(cls, path: str, mmap: bool = True):
+        """Loads a Time_Set written by save() as an Array_Time_Set.
+
+        Parameters:
+            path : str - the file to load.
+            mmap : bool - memory-map the file rather than read it, so the set
+                is queryable immediately and only the pages touched are read.
+        """
+        with open(path, "rb") as file:
+            header = file.read(_FILE_HEADER.size)
+        if len(header) != _FILE_HEADER.size:
+            raise ValueError(path + " is not a Time_Set file.")
+        magic, version, normalized, length, unit, tz_name = _FILE_HEADER.unpack(header)
+        if magic != _FILE_MAGIC:
+            raise ValueError(path + " is not a Time_Set file.")
+        if version != _FILE_VERSION:
+            raise ValueError("Unsupported Time_Set file version " + str(version) + ".")
+        if unit.rstrip(b"\0") != b"ns":
+            raise ValueError("Unsupported Time_Set file unit " + str(unit) + ".")
+        if tz_name.rstrip(b"\0") not in (b"", b"UTC"):
+            raise ValueError("Unsupported Time_Set file timezone " + str(tz_name) + ".")
+        utc = tz_name.rstrip(b"\0") == b"UTC"
+
+        if mmap:
+            times = np.memmap(
+                path,
+                dtype="<i8",
+                mode="r",
+                offset=_FILE_HEADER.size,
+                shape=(2, length),
+            )
+        else:
+            times = np.fromfile(
+                path, dtype="<i8", offset=_FILE_HEADER.size, count=2 * length
+            ).reshape(2, length)
+        # a no-op on little-endian machines, so the memory map is kept.
+        times = times.astype(np.int64, copy=False).view("datetime64[ns]")
+
+        if normalized:
+            return Array_Time_Set._from_normalized(times[0], times[1], utc)
+        return Array_Time_Set._from_sorted(times[0], times[1], utc)
 
     def __eq__(self, other):
         """Determines if this Time_Set is equal to another."""
+        if not isinstance(other, Time_Set):
+            return NotImplemented
         return True if self.time_intervals == other.time_intervals else False
 
+    @_cached_result
+    def __hash__(self):
+        """Returns a hash that is the same for equal Time_Sets of any kind.
+
+        It is a hash of the datetime64 arrays, so an Array_Time_Set is hashed
+        without building its time intervals.
+        """
+        try:
+            starts, ends = self._as_arrays()
+        except TypeError:
+            # integer times have no arrays, and only list-backed sets hold them.
+            return hash(tuple(self.time_intervals))
+        return hash((starts.tobytes(), ends.tobytes(), self.is_utc))
+
+    def __len__(self):
+        """Returns the number of time intervals in the Time_Set."""
+        return len(self.time_intervals)
+
+    def __iter__(self):
+        """Iterates over the time intervals in order of start time."""
+        return iter(self.time_intervals)
+
+    def __getitem__(self, ix):
+        """Returns the time interval(s) at the given position."""
+        return self.time_intervals[ix]
+
+    @_cached_result
     def __str__(self):
         """Returns a string representation of a Time_Set."""
         ret_str = "-" * 71 + "\n"
@@ -28,13 +362,17 @@ class Time_Set:
         return ret_str
 
     def append(self, time_interval):
-        """Appends a time interval(s) to the Time_Set."""
+        """Appends a time interval(s) to the Time_Set.
+
+        Only the new time intervals are validated. Since the existing ones are
+        already sorted, sorting the combined list only has to merge two runs.
+        For many single appends, use an Incremental_Time_Set instead.
+        """
+        if isinstance(time_interval, Time_Interval):
+            time_interval = [time_interval]
         if isinstance(time_interval, list):
-            return Time_Set(self.time_intervals + time_interval)
-        elif isinstance(time_interval, Time_Interval):
-            temp = self.time_intervals
-            temp.append(time_interval)
-            return Time_Set(temp)
+            self.validate_list_of_time_intervals(time_interval)
+            return Time_Set._from_sorted(sorted(self.time_intervals + time_interval))
 
     def validate_list_of_time_intervals(self, time_intervals: list):
         """Returns true if the passed list is all of type Time_Interval."""
@@ -45,6 +383,267 @@ class Time_Set:
                     + " type found in the passed list is not of type Time_Interval."
                 )
 
+    @property
+    def is_utc(self) -> bool:
+        """True if the time intervals are tz-aware, and so held in UTC."""
+        return (
+            len(self.time_intervals) > 0
+            and getattr(self.time_intervals[0].start, "tzinfo", None) is not None
+        )
+
+    def _output_tz(self, tz):
+        """Returns the timezone to render results in, None for naive results."""
+        if tz is None:
+            return "UTC" if self.is_utc else None
+        if len(self) and not self.is_utc:
+            raise ValueError("Only a tz-aware Time_Set can be rendered in a timezone.")
+        return tz
+
+    def _as_arrays(self):
+        """Returns the start and end times as two datetime64[ns] arrays.
+
+        The times of a tz-aware Time_Set are returned as naive UTC times.
+        Raises a TypeError for times that are not datetimes, such as integers,
+        which cannot be converted without changing their meaning.
+        """
+        if self.time_intervals and not isinstance(
+            self.time_intervals[0].start, (datetime, np.datetime64)
+        ):
+            raise TypeError(
+                "This Time_Set operation needs datetime times, not "
+                + str(type(self.time_intervals[0].start))
+                + "."
+            )
+        starts = [i.start for i in self.time_intervals]
+        ends = [i.end for i in self.time_intervals]
+        if self.is_utc:
+            return _to_utc_datetime64(starts), _to_utc_datetime64(ends)
+        # unlike np.array(), this keeps the nanoseconds of pd.Timestamps.
+        return (
+            pd.DatetimeIndex(starts).as_unit("ns").to_numpy(),
+            pd.DatetimeIndex(ends).as_unit("ns").to_numpy(),
+        )
+
+    @property
+    def index(self):
+        """The Time_Set_Index used by the query methods, built on first use.
+
+        A Time_Set is never changed in place (append() returns a new one), so
+        the index stays valid for the life of the Time_Set.
+        """
+        if "index" not in self._cache:
+            self._cache["index"] = Time_Set_Index(self.time_intervals)
+        return self._cache["index"]
+
+    def contains(self, time) -> bool:
+        """Returns True if any time interval contains the given time."""
+        return self.index.contains(time)
+
+    def containing(self, time) -> list:
+        """Returns the time intervals that contain the given time."""
+        return self.index.containing(time)
+
+    def overlapping(self, start, end) -> list:
+        """Returns the time intervals that overlap [start, end)."""
+        return self.index.overlapping(start, end)
+
+    def covering(self, start, end) -> list:
+        """Returns the time intervals that [start, end) is nested in."""
+        return self.index.covering(start, end)
+
+    def contains_many(self, times, return_index: bool = False):
+        """Tests many times for membership in the Time_Set at once.
+
+        Every time is located in the normalized union with one vectorized
+        binary search, so a time is inside if it is at or after the start of
+        the last union interval starting at or before it, and before its end.
+
+        Parameters:
+            times : list, np.ndarray or pd.Series - the times to test.
+            return_index : bool - also return, for each time, the position of
+                the compute_union() time interval containing it, or -1.
+        """
+        union = self.compute_union()
+        union_starts, union_ends = union._as_arrays()
+        utc_times = _to_utc_datetime64(times)
+        _check_tz(union, utc_times is not None)
+        times = _to_datetime64(times) if utc_times is None else utc_times
+
+        positions = np.searchsorted(union_starts, times, side="right") - 1
+        inside = positions >= 0
+        inside[inside] = times[inside] < union_ends[positions[inside]]
+        if return_index:
+            return inside, np.where(inside, positions, -1)
+        return inside
+
+    def coverage(self, freq: str = "1h", start=None, end=None, tz=None) -> pd.Series:
+        """Returns how much time the Time_Set covers in each calendar bucket.
+
+        Instead of intersecting every time interval with every bucket, the
+        total time covered before each bucket edge is found by a binary
+        search over the normalized union and a running sum of its lengths,
+        so each bucket is the difference of two such totals.
+
+        Parameters:
+            freq : str - the bucket size as a pandas frequency, e.g. "1h" or "W".
+            start : datetime - the first bucket edge. Defaults to the start of
+                the union, rounded down to freq.
+            end : datetime - the last bucket edge. Defaults to the end of the
+                union, rounded up to a whole bucket.
+            tz : str or tzinfo - for a tz-aware Time_Set, the timezone whose
+                calendar the buckets follow, so a day that a DST change makes
+                23 or 25 hours long is one bucket. Defaults to UTC.
+        """
+        union_starts, union_ends = self.compute_union()._as_arrays()
+        edges, index = _bucket_edges(
+            union_starts, union_ends, freq, start, end, self._output_tz(tz)
+        )
+        covered = _covered_before(union_starts, union_ends, edges)
+        return pd.Series(
+            np.diff(covered).astype("timedelta64[ns]"),
+            index=index[:-1],
+            name="coverage",
+        )
+
+    def rolling_coverage(
+        self, window: str, freq: str = "1h", start=None, end=None, tz=None
+    ) -> pd.Series:
+        """Returns how much time the Time_Set covers in a trailing window.
+
+        The result is indexed by the end of each window, stepping by freq
+        over the same bucket edges as coverage(), so a window equal to freq
+        gives the values of coverage().
+
+        Parameters:
+            window : str - the window length as a pandas timedelta, e.g. "3h".
+            freq : str - the step between windows as a pandas frequency.
+            start : datetime - see coverage().
+            end : datetime - see coverage().
+            tz : str or tzinfo - see coverage().
+        """
+        union_starts, union_ends = self.compute_union()._as_arrays()
+        edges, index = _bucket_edges(
+            union_starts, union_ends, freq, start, end, self._output_tz(tz)
+        )
+        edges, index = edges[1:], index[1:]
+        window = pd.Timedelta(window).to_timedelta64().astype("timedelta64[ns]")
+        covered = _covered_before(union_starts, union_ends, edges) - _covered_before(
+            union_starts, union_ends, edges - window
+        )
+        return pd.Series(
+            covered.astype("timedelta64[ns]"),
+            index=index,
+            name="coverage",
+        )
+
+    def depth_profile(self):
+        """Returns how many time intervals are active over time, as a step function.
+
+        Every start is an event of +1 and every end an event of -1. Sorting
+        the events once and taking a running sum gives the number of active
+        time intervals, which holds from each breakpoint until the next. Since
+        time intervals are open on the right, one ending at the same time
+        another starts does not count as overlapping it.
+
+        Returns:
+            breakpoints : np.ndarray - the datetime64[ns] times the count changes,
+                in UTC for a tz-aware Time_Set.
+            counts : np.ndarray - the count from each breakpoint to the next;
+                the last is always 0.
+        """
+        starts, ends = self._as_arrays()
+        times = np.concatenate([starts, ends])
+        changes = np.concatenate(
+            [np.ones(len(starts), dtype=np.int64), -np.ones(len(ends), dtype=np.int64)]
+        )
+        breakpoints, event = np.unique(times, return_inverse=True)
+        net_changes = np.zeros(len(breakpoints), dtype=np.int64)
+        np.add.at(net_changes, event, changes)
+
+        changed = net_changes != 0
+        return breakpoints[changed], np.cumsum(net_changes[changed])
+
+    def intervals_with_depth(self, min_depth: int):
+        """Returns the time covered by at least min_depth time intervals at once.
+
+        For example, intervals_with_depth(3) is the time when three or more
+        time intervals overlap. The result is normalized.
+        """
+        if min_depth < 1:
+            raise ValueError("min_depth must be at least 1.")
+        breakpoints, counts = self.depth_profile()
+        deep = counts >= min_depth
+        was_deep = np.concatenate([[False], deep[:-1]])
+        return self._wrap_normalized_arrays(
+            breakpoints[deep & ~was_deep], breakpoints[~deep & was_deep]
+        )
+
+    def gaps(self, min_length=None):
+        """Returns the time between the time intervals of the Time_Set.
+
+        The gaps are read straight off the normalized union, from the end of
+        each of its time intervals to the start of the next, in one
+        vectorized pass.
+
+        Parameters:
+            min_length : timedelta or str - only keep gaps at least this long.
+        """
+        union_starts, union_ends = self.compute_union()._as_arrays()
+        return self._wrap_gaps(union_ends[:-1], union_starts[1:], min_length)
+
+    def complement(self, within, min_length=None):
+        """Returns the time inside a time interval that the Time_Set does not cover.
+
+        Parameters:
+            within : Time_Interval - the window to find free time in.
+            min_length : timedelta or str - only keep gaps at least this long.
+        """
+        union = self.compute_union()
+        union_starts, union_ends = union._as_arrays()
+        utc = getattr(within.start, "tzinfo", None) is not None
+        _check_tz(union, utc)
+        start, end = _to_datetime64([within.start, within.end])
+        first = np.searchsorted(union_ends, start, side="right")
+        last = np.searchsorted(union_starts, end, side="left")
+        return self._wrap_gaps(
+            np.concatenate([[start], union_ends[first:last]]),
+            np.concatenate([union_starts[first:last], [end]]),
+            min_length,
+            utc,
+        )
+
+    def _wrap_gaps(self, starts, ends, min_length, utc: bool = None):
+        """Drops empty gaps and those shorter than min_length, then wraps them."""
+        lengths = ends - starts
+        keep = lengths > np.timedelta64(0, "ns")
+        if min_length is not None:
+            keep &= lengths >= pd.Timedelta(min_length).to_timedelta64()
+        return self._wrap_normalized_arrays(starts[keep], ends[keep], utc)
+
+    def _wrap_normalized_arrays(self, starts, ends, utc: bool = None):
+        """Returns a normalized Time_Set of this kind from datetime64 arrays.
+
+        The arrays hold naive UTC times if utc, which defaults to is_utc.
+        """
+        if utc is None:
+            utc = self.is_utc
+        return Time_Set._from_normalized(_time_intervals_from_arrays(starts, ends, utc))
+
+    @_cached_result
+    def total_duration(self):
+        """Returns the total time covered, counting overlapping time once."""
+        starts, ends = self.compute_union()._as_arrays()
+        return (ends - starts).sum().astype("timedelta64[us]").item()
+
+    @_cached_result
+    def bounding_interval(self):
+        """Returns the time interval from the first start to the last end, or None."""
+        union = self.compute_union()
+        if len(union) == 0:
+            return None
+        return Time_Interval._unchecked(union[0].start, union[-1].end)
+
+    @_cached_result
     def compute_intersection(self):
         """Sets the intersection of this Time_Set."""
         if len(self.time_intervals) == 0:
@@ -57,34 +656,36 @@ class Time_Set:
                 return None
         return intersection
 
-    def compute_union(self):
+    @_cached_result
+    def compute_union(self, workers: int = None):
         """Computes the union of this Time_Set.
-        
+
         Since this needs to be quite fast, it is not immidiately obvious how
-        this method works. Firstly, it sorts the list by start times. Then,
-        it searches the list for all time intervals that still overlap with
-        the first one, and returns the union of all time intervals that overlap
-        with the first, removes them all, then continues until the list is
-        empty. Thus, ensuring that the union is correct without needing to
+        this method works. The constructor already keeps the list sorted by
+        start times, so the union is found in a single sweep: walk the list
+        once, extending the current block while the next time interval starts
+        at or before the latest end seen so far, and closing the block as soon
+        as one starts after it. This runs in O(n) and never copies or slices
+        the list. Thus, ensuring that the union is correct without needing to
         check if the final list is disjoint or not.
-        
+
         Example:
              [ 1  ]
-        [ 2 ]      
+        [ 2 ]
            [  3 ]
                     [ 4  ]
              [5]
                        [ 6  ]
-                       
-        Step 1: Sort
+
+        Step 1: Sorted by the constructor
         [ 2 ]
            [  3 ]
              [ 1  ]
              [5]
                     [ 4  ]
                        [ 6  ]
-        
-        Step 2: find the connected blocks
+
+        Step 2: sweep once, finding the connected blocks
         -----------|
         [ 2 ]      |
            [  3 ]  |
@@ -94,39 +695,188 @@ class Time_Set:
                    |[ 4  ]   |
                    |   [ 6  ]|
                    |---------|
-        
+
         Step 3: return the earliest start and latest end for each block.
         -----------|
         {    A    }|
         -----------|---------|
                    |{   B   }|
                    |---------|
-        """
-        time_intervals = self.time_intervals.copy()
 
-        if len(time_intervals) == 0:
-            return Time_Set([])
+        The returned Time_Set is flagged as normalized, so computing its union
+        again returns it immediately.
+
+        Parameters:
+            workers : int - if more than one, the sorted time intervals are split
+                into chunks that are merged in a pool of this many processes. The
+                result holds the same times as the serial union, so it needs
+                datetime times; see _as_arrays().
+        """
+        if self.is_normalized:
+            return self
+        if len(self.time_intervals) == 0:
+            return Time_Set._from_normalized([])
+        if workers is not None and workers > 1:
+            starts, ends = self._as_arrays()
+            union_starts, _ = _parallel_union_arrays(starts, ends, workers)
+            # map the union back onto the time intervals, so that it holds the
+            # original time objects, as the serial union does: each block runs
+            # from its first start to the end that reaches the running maximum.
+            firsts = np.searchsorted(starts, union_starts, side="left")
+            lasts = np.append(firsts[1:], len(starts)) - 1
+            reaching = np.where(
+                ends == np.maximum.accumulate(ends), np.arange(len(ends)), 0
+            )
+            reaching = np.maximum.accumulate(reaching)[lasts]
+            time_intervals = self.time_intervals
+            return Time_Set._from_normalized(
+                [
+                    Time_Interval._unchecked(
+                        time_intervals[first].start, time_intervals[last].end
+                    )
+                    for first, last in zip(firsts.tolist(), reaching.tolist())
+                ]
+            )
 
-        time_intervals = sorted(time_intervals)
         union = []
-        latest_end = time_intervals[0].end
+        intervals = iter(self.time_intervals)
+        block = next(intervals)
+        latest_end = block.end
+
+        for time_interval in intervals:
+            if time_interval.start <= latest_end:
+                if time_interval.end > latest_end:
+                    latest_end = time_interval.end
+            else:
+                union.append(
+                    block
+                    if latest_end == block.end
+                    else Time_Interval._unchecked(block.start, latest_end)
+                )
+                block = time_interval
+                latest_end = time_interval.end
 
-        while len(time_intervals) > 1:
-            for ix, i in enumerate(time_intervals):
-                if i.start <= latest_end:
-                    latest_end = i.end if i.end >= latest_end else latest_end
-                if i.start > latest_end or ix + 1 == len(time_intervals):
-                    union.append(Time_Interval(time_intervals[0].start, latest_end))
-                    time_intervals = time_intervals[ix:]
-                    latest_end = time_intervals[0].end
-                    break
+        union.append(
+            block
+            if latest_end == block.end
+            else Time_Interval._unchecked(block.start, latest_end)
+        )
+
+        return Time_Set._from_normalized(union)
 
-        if time_intervals[0].start > union[-1].end:
-            union.append(time_intervals[0])
-        elif time_intervals[0].start == union[-1].end:
-            union[-1].end = time_intervals[0].end
+    def __or__(self, other):
+        """Returns the time covered by this Time_Set or the other."""
+        return self.set_operation(other, "|")
 
-        return Time_Set(union)
+    def __and__(self, other):
+        """Returns the time covered by both this Time_Set and the other."""
+        return self.set_operation(other, "&")
+
+    def __sub__(self, other):
+        """Returns the time covered by this Time_Set but not the other."""
+        return self.set_operation(other, "-")
+
+    def __xor__(self, other):
+        """Returns the time covered by exactly one of this Time_Set and the other."""
+        return self.set_operation(other, "^")
+
+    def set_operation(self, other, symbol: str):
+        """A helper function for the set operators that caches their results.
+
+        The results between recently paired Time_Sets are kept in a least
+        recently used cache bounded by the number of time intervals it holds,
+        so repeating an operation between the same values is a lookup. Use
+        clear_cache() to empty it. Time_Sets that are not hashable are never
+        cached.
+        """
+        if isinstance(other, Time_Interval):
+            other = Time_Set([other])
+        if not isinstance(other, Time_Set):
+            return NotImplemented
+        if self.__hash__ is None or other.__hash__ is None:
+            return self.merge_sweep(other, _SET_OPERATIONS[symbol])
+        return _cached_set_operation(self, other, symbol)
+
+    def merge_sweep(self, other, keep):
+        """A helper function for the set operators between two Time_Sets.
+
+        Both Time_Sets are normalized, then their start and end times are
+        walked in order with one pointer into each, tracking whether the
+        sweep is currently inside each set. Time is kept wherever
+        keep(in_self, in_other) is True, so every set operation is a single
+        O(n + m) pass that returns a normalized Time_Set.
+
+        If either Time_Set is an Array_Time_Set, the sweep runs on the arrays
+        instead, without building a Time_Interval per element.
+        """
+        if isinstance(self, Array_Time_Set) or isinstance(other, Array_Time_Set):
+            return self._merge_sweep_arrays(other, keep)
+        a = self.compute_union().time_intervals
+        b = other.compute_union().time_intervals
+
+        result = []
+        ia = ib = 0
+        in_a = in_b = False
+        kept_since = None
+        while ia < len(a) or ib < len(b):
+            next_a = None if ia == len(a) else (a[ia].end if in_a else a[ia].start)
+            next_b = None if ib == len(b) else (b[ib].end if in_b else b[ib].start)
+            if next_b is None or (next_a is not None and next_a <= next_b):
+                now = next_a
+            else:
+                now = next_b
+            if next_a == now:
+                ia += in_a
+                in_a = not in_a
+            if next_b == now:
+                ib += in_b
+                in_b = not in_b
+
+            if keep(in_a, in_b):
+                if kept_since is None:
+                    kept_since = now
+            elif kept_since is not None:
+                result.append(Time_Interval._unchecked(kept_since, now))
+                kept_since = None
+
+        return Time_Set._from_normalized(result)
+
+    def _merge_sweep_arrays(self, other, keep):
+        """The vectorized form of merge_sweep().
+
+        The start and end times of each normalized union interleave into one
+        increasing array of boundaries, and a stable sort merges the two. A
+        time is inside a union once an odd number of its boundaries have
+        passed, so a running count of the boundaries from each side gives
+        in_self and in_other after every boundary, and keep() is looked up in
+        a table for all of them at once. Time is kept from each boundary where
+        keeping starts to the next where it stops.
+        """
+        a, b = self.compute_union(), other.compute_union()
+        if len(a):
+            _check_tz(b, a.is_utc)
+        a_bounds = np.column_stack(a._as_arrays()).ravel().view(np.int64)
+        b_bounds = np.column_stack(b._as_arrays()).ravel().view(np.int64)
+
+        bounds = np.concatenate([a_bounds, b_bounds])
+        order = np.argsort(bounds, kind="stable")
+        times = bounds[order]
+        from_a = order < len(a_bounds)
+        in_a = np.cumsum(from_a) % 2 == 1
+        in_b = np.cumsum(~from_a) % 2 == 1
+        # where both sides share a boundary, the state after the last one holds.
+        last = np.append(times[1:] != times[:-1], True)
+        times, in_a, in_b = times[last].view("datetime64[ns]"), in_a[last], in_b[last]
+
+        table = np.array(
+            [[keep(in_a, in_b) for in_b in (False, True)] for in_a in (False, True)],
+            dtype=bool,
+        )
+        kept = table[in_a.astype(np.intp), in_b.astype(np.intp)]
+        was_kept = np.concatenate([[False], kept[:-1]])
+        return self._wrap_normalized_arrays(
+            times[kept & ~was_kept], times[~kept & was_kept], a.is_utc or b.is_utc
+        )
 
 
 class Time_Interval:
@@ -137,23 +887,66 @@ class Time_Interval:
     being open (excluded). This was chosen because it is what we colloquially mean when
     we reference time intervals. For example: from eight to nine means the 60 minutes from
     8:00 to 8:59, but not the next minute (from 9:00 to 9:01). Thus the intervals are clopen.
+
+    Time intervals use __slots__ rather than a __dict__ to stay small, since a Time_Set can
+    hold millions of them. The start and end may also be integers, such as epoch
+    nanoseconds, in which case every comparison is an integer comparison. A Time_Set
+    of integer time intervals supports the methods that work on Time_Interval
+    objects, such as compute_union(), the set operators and the queries; those that
+    work on datetime64 arrays, such as total_duration() and coverage(), raise a
+    TypeError rather than treat the integers as datetimes.
+
+    tz-aware start and end times are converted to UTC, so time intervals recorded
+    in different timezones compare correctly, and time_elapsed is the real time
+    elapsed even across a DST change. Use astimezone() to render them in a zone.
     """
 
+    __slots__ = ("start", "end")
+
     def __init__(self, start: str, end: str):
         """Creates a time interval from datetime objects.
         
         Parameters:
-            start : datetime.datetime - start time.
-            end : datetime.datetime - end time.
+            start : datetime.datetime or int - start time.
+            end : datetime.datetime or int - end time.
         """
-        if start > end:
+        # the common case of a plain datetime is checked without getattr().
+        if type(start) is datetime:
+            if start.tzinfo is not None:
+                start, end = _as_utc(start, end)
+        elif getattr(start, "tzinfo", None) is not None:
+            start, end = _as_utc(start, end)
+        if start >= end:
+            if start == end:
+                raise ValueError("End time is equal to start time.")
             raise ValueError("End time is before start time.")
-        if start == end:
-            raise ValueError("End time is equal to start time.")
 
         self.start = start
         self.end = end
-        self.time_elapsed = end - start
+
+    def __hash__(self):
+        """Returns a hash of the start and end times."""
+        return hash((self.start, self.end))
+
+    @classmethod
+    def _unchecked(cls, start, end):
+        """Creates a time interval without checking that start is before end.
+
+        Only for internal code paths that already know the times are valid.
+        """
+        time_interval = object.__new__(cls)
+        time_interval.start = start
+        time_interval.end = end
+        return time_interval
+
+    @property
+    def time_elapsed(self):
+        """The length of the time interval, computed when it is read."""
+        return self.end - self.start
+
+    def astimezone(self, tz) -> tuple:
+        """Returns the start and end times of a tz-aware time interval in tz."""
+        return self.start.astimezone(tz), self.end.astimezone(tz)
 
     @classmethod
     def from_strings(cls, start: str, end: str, time_format: str = "%m/%d/%Y %H:%M"):
@@ -164,17 +957,39 @@ class Time_Interval:
             end : str - end time in a time_format for datetime.strptime to parse.
             time_format : str - the time format for datetime.strptime to parse.
         """
-        start_time = datetime.strptime(start, time_format)
-        end_time = datetime.strptime(end, time_format)
+        parse = _compile_time_format(time_format)
+        start_time = parse(start)
+        end_time = parse(end)
 
         return cls(start_time, end_time)
 
+    @classmethod
+    def from_string_pairs(
+        cls, starts: list, ends: list, time_format: str = "%m/%d/%Y %H:%M"
+    ) -> list:
+        """Creates a list of time intervals from lists of strings.
+
+        The time format is compiled once into a specialized parser, which is
+        much faster than calling datetime.strptime for every string.
+
+        Parameters:
+            starts : list - start times in time_format.
+            ends : list - end times in time_format, one per start time.
+            time_format : str - the time format for datetime.strptime to parse.
+        """
+        if len(starts) != len(ends):
+            raise ValueError("There must be exactly one end time per start time.")
+        parse = _compile_time_format(time_format)
+        return [cls(parse(start), parse(end)) for start, end in zip(starts, ends)]
+
     def __str__(self):
         """Returns a string representation of the time interval."""
         return "Start: " + str(self.start) + " | End: " + str(self.end)
 
     def __eq__(self, other):
         """Returns if the Time_Intervals start and stop at the same time."""
+        if not isinstance(other, Time_Interval):
+            return NotImplemented
         return self.start == other.start and self.end == other.end
 
     def __lt__(self, other):
@@ -233,9 +1048,9 @@ class Time_Interval:
         if self == other:
             return None
         if other.start > self.start:
-            return Time_Interval(self.start, other.start)
+            return Time_Interval._unchecked(self.start, other.start)
         if other.end < self.end:
-            return Time_Interval(other.end, self.end)
+            return Time_Interval._unchecked(other.end, self.end)
 
     def intersection(self, other):
         """Returns the intersection of this Time_Interval and another.
@@ -259,10 +1074,10 @@ class Time_Interval:
         earliest_start = min(self.start, other.start)
         latest_end = max(self.end, other.end)
         if self.start == other.end or other.start == self.end:
-            return Time_Interval(earliest_start, latest_end)
+            return Time_Interval._unchecked(earliest_start, latest_end)
         if self.is_disjoint_with(other):
             return Time_Set([self, other])
-        return Time_Interval(earliest_start, latest_end)
+        return Time_Interval._unchecked(earliest_start, latest_end)
 
     def is_disjoint_with(self, other) -> bool:
         """Returns True if this time interval is disjoint with the other.
@@ -283,3 +1098,1199 @@ class Time_Interval:
             return True
         else:
             return False
+
+
+class Time_Set_Index:
+    """A sorted index for point and range queries over time intervals.
+
+    Time intervals are kept sorted by start time alongside a running maximum
+    of their end times. Since the running maximum only ever grows, both lists
+    can be bisected: the start times bound the last candidate for a query,
+    and the running maximum bounds the first, so a query is two O(log n)
+    bisections followed by a scan of the candidates between them.
+    """
+
+    def __init__(self, time_intervals: list):
+        """Builds the index from a list of Time_Intervals sorted by start time."""
+        self.time_intervals = time_intervals
+        self.starts = [i.start for i in time_intervals]
+        self.latest_ends = list(
+            itertools.accumulate((i.end for i in time_intervals), max)
+        )
+
+    def contains(self, time) -> bool:
+        """Returns True if any time interval contains the given time.
+
+        The first time interval whose running maximum end is after the given
+        time is the one that reaches that maximum, so only it needs checking.
+        """
+        first = bisect.bisect_right(self.latest_ends, time)
+        return first < len(self.starts) and self.starts[first] <= time
+
+    def containing(self, time) -> list:
+        """Returns the time intervals that contain the given time."""
+        first = bisect.bisect_right(self.latest_ends, time)
+        last = bisect.bisect_right(self.starts, time)
+        return [i for i in self.time_intervals[first:last] if i.end > time]
+
+    def overlapping(self, start, end) -> list:
+        """Returns the time intervals that overlap [start, end).
+
+        Time intervals that only share an endpoint with [start, end) do not
+        overlap it, since time intervals are open on the right.
+        """
+        first = bisect.bisect_right(self.latest_ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        return [i for i in self.time_intervals[first:last] if i.end > start]
+
+    def covering(self, start, end) -> list:
+        """Returns the time intervals that [start, end) is nested in."""
+        first = bisect.bisect_left(self.latest_ends, end)
+        last = bisect.bisect_right(self.starts, start)
+        return [i for i in self.time_intervals[first:last] if i.end >= end]
+
+
+class Array_Time_Set_Index:
+    """The query index of an Array_Time_Set, searching its arrays with numpy.
+
+    It works like Time_Set_Index, with np.searchsorted over the start times
+    and over a running maximum of the end times, so building it creates no
+    Time_Interval objects; only the time intervals a query returns are built.
+    """
+
+    def __init__(self, time_set):
+        """Builds the index from an Array_Time_Set."""
+        self.time_set = time_set
+        self.starts = time_set.starts
+        self.ends = time_set.ends
+        self.latest_ends = np.maximum.accumulate(time_set.ends)
+
+    def contains(self, time) -> bool:
+        """Returns True if any time interval contains the given time."""
+        time = self._as_datetime64(time)
+        first = np.searchsorted(self.latest_ends, time, side="right")
+        return bool(first < len(self.starts) and self.starts[first] <= time)
+
+    def containing(self, time) -> list:
+        """Returns the time intervals that contain the given time."""
+        time = self._as_datetime64(time)
+        first = np.searchsorted(self.latest_ends, time, side="right")
+        last = np.searchsorted(self.starts, time, side="right")
+        return self._matches(first, last, self.ends[first:last] > time)
+
+    def overlapping(self, start, end) -> list:
+        """Returns the time intervals that overlap [start, end)."""
+        start, end = self._as_datetime64(start), self._as_datetime64(end)
+        first = np.searchsorted(self.latest_ends, start, side="right")
+        last = np.searchsorted(self.starts, end, side="left")
+        return self._matches(first, last, self.ends[first:last] > start)
+
+    def covering(self, start, end) -> list:
+        """Returns the time intervals that [start, end) is nested in."""
+        start, end = self._as_datetime64(start), self._as_datetime64(end)
+        first = np.searchsorted(self.latest_ends, end, side="left")
+        last = np.searchsorted(self.starts, start, side="right")
+        return self._matches(first, last, self.ends[first:last] >= end)
+
+    def _as_datetime64(self, time):
+        """Returns a query time as a datetime64[ns], in UTC if it is tz-aware."""
+        _check_tz(self.time_set, getattr(time, "tzinfo", None) is not None)
+        return _to_datetime64([time])[0]
+
+    def _matches(self, first: int, last: int, matches) -> list:
+        """Builds the candidates between first and last that match."""
+        positions = first + np.flatnonzero(matches)
+        return _time_intervals_from_arrays(
+            self.starts[positions], self.ends[positions], self.time_set.is_utc
+        )
+
+
+class Array_Time_Set(Time_Set):
+    """A Time_Set stored as two contiguous datetime64[ns] arrays.
+
+    Instead of one Time_Interval object per element, the start and end times
+    live in two sorted numpy arrays, and compute_union(), compute_intersection(),
+    append() and == run as vectorized kernels on them. Time_Interval objects
+    are only built when an element is indexed or iterated. The half-open
+    semantics are the same as Time_Interval's: starts are included, ends are
+    excluded, and time intervals that share an endpoint are merged by a union.
+
+    Materialized elements hold datetime.datetime objects, or pd.Timestamps
+    when the times are not whole microseconds, so no precision is lost.
+
+    tz-aware times are stored as naive UTC times, converted in one vectorized
+    step, so the kernels run on plain int64 nanoseconds either way; only
+    materialized elements are tz-aware again.
+    """
+
+    def __init__(self, starts, ends):
+        """Constructs an Array_Time_Set from start and end times.
+
+        Parameters:
+            starts : array-like - start times, convertible to datetime64[ns],
+                or tz-aware times.
+            ends : array-like - end times, convertible to datetime64[ns],
+                or tz-aware times.
+        """
+        utc_starts, utc_ends = _to_utc_datetime64(starts), _to_utc_datetime64(ends)
+        if (utc_starts is None) != (utc_ends is None):
+            raise ValueError(
+                "Start and end times must either both be tz-aware or both be naive."
+            )
+        if utc_starts is not None:
+            starts, ends = utc_starts, utc_ends
+        starts = np.asarray(starts, dtype="datetime64[ns]")
+        ends = np.asarray(ends, dtype="datetime64[ns]")
+        self.validate_arrays(starts, ends)
+
+        if len(starts) > 1 and np.any(starts[1:] < starts[:-1]):
+            order = np.argsort(starts, kind="stable")
+            starts, ends = starts[order], ends[order]
+
+        self.starts = starts
+        self.ends = ends
+        self._utc = utc_starts is not None
+        self.is_normalized = False
+        self._cache = {}
+        self._time_intervals = None
+
+    @classmethod
+    def _from_normalized(cls, starts, ends, utc: bool = False):
+        """Wraps arrays that are already sorted, disjoint and merged."""
+        time_set = cls._from_sorted(starts, ends, utc)
+        time_set.is_normalized = True
+        return time_set
+
+    @classmethod
+    def _from_sorted(cls, starts, ends, utc: bool = False):
+        """Wraps valid arrays that are already sorted by start time.
+
+        If utc, the arrays hold the naive UTC times of a tz-aware set.
+        """
+        time_set = cls.__new__(cls)
+        time_set.starts = starts
+        time_set.ends = ends
+        time_set._utc = utc
+        time_set.is_normalized = False
+        time_set._time_intervals = None
+        time_set._cache = {}
+        return time_set
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        dataframe: pd.core.frame.DataFrame,
+        start_column: str = "start",
+        end_column: str = "end",
+        time_format: str = None,
+        errors: str = "raise",
+        tz=None,
+    ):
+        """Constructs an Array_Time_Set from a pandas dataframe.
+
+        Takes the same parameters as Time_Set.from_dataframe(). Columns that
+        are already datetime64[ns] and sorted by start time are wrapped
+        without being copied.
+        """
+        starts, ends, utc = _dataframe_to_arrays(
+            dataframe, start_column, end_column, time_format, errors, tz
+        )
+        time_set = cls(starts, ends)
+        time_set._utc = utc
+        return time_set
+
+    @classmethod
+    def from_time_set(cls, time_set: Time_Set):
+        """Constructs an Array_Time_Set from a Time_Set."""
+        if isinstance(time_set, Array_Time_Set):
+            return time_set
+        array_time_set = cls._from_sorted(*time_set._as_arrays(), time_set.is_utc)
+        array_time_set.is_normalized = time_set.is_normalized
+        return array_time_set
+
+    @staticmethod
+    def validate_arrays(starts, ends):
+        """Raises if the arrays do not describe valid time intervals."""
+        if starts.ndim != 1 or starts.shape != ends.shape:
+            raise ValueError("Start and end times must be 1-d arrays of equal length.")
+        if np.any(np.isnat(starts)) or np.any(np.isnat(ends)):
+            raise ValueError("Start and end times must not be NaT.")
+        if np.any(starts > ends):
+            raise ValueError("End time is before start time.")
+        if np.any(starts == ends):
+            raise ValueError("End time is equal to start time.")
+
+    @property
+    def time_intervals(self) -> list:
+        """The time intervals as Time_Interval objects, built on first access."""
+        if self._time_intervals is None:
+            self._time_intervals = list(self)
+        return self._time_intervals
+
+    @property
+    def is_utc(self) -> bool:
+        """True if the time intervals are tz-aware, and so held in UTC."""
+        return self._utc
+
+    def _as_arrays(self):
+        """Returns the start and end times as two datetime64[ns] arrays."""
+        return self.starts, self.ends
+
+    @property
+    def index(self):
+        """The Array_Time_Set_Index used by the query methods, built on first use."""
+        if "index" not in self._cache:
+            self._cache["index"] = Array_Time_Set_Index(self)
+        return self._cache["index"]
+
+    def __len__(self):
+        """Returns the number of time intervals in the Time_Set."""
+        return len(self.starts)
+
+    def __iter__(self):
+        """Iterates over the time intervals, building them in chunks."""
+        chunk_size = 65536
+        for ix in range(0, len(self.starts), chunk_size):
+            starts = _datetimes_from_array(self.starts[ix : ix + chunk_size], self._utc)
+            ends = _datetimes_from_array(self.ends[ix : ix + chunk_size], self._utc)
+            for start, end in zip(starts, ends):
+                yield Time_Interval._unchecked(start, end)
+
+    def __getitem__(self, ix):
+        """Returns the time interval at ix, or an Array_Time_Set for a slice."""
+        if isinstance(ix, slice):
+            if ix.step is not None and ix.step < 0:
+                raise ValueError("Array_Time_Set slices must keep start time order.")
+            return Array_Time_Set._from_sorted(
+                self.starts[ix], self.ends[ix], self._utc
+            )
+        return Time_Interval._unchecked(
+            _datetimes_from_array(self.starts[[ix]], self._utc)[0],
+            _datetimes_from_array(self.ends[[ix]], self._utc)[0],
+        )
+
+    __hash__ = Time_Set.__hash__
+
+    def __eq__(self, other):
+        """Determines if this Time_Set is equal to another."""
+        if not isinstance(other, Time_Set):
+            return NotImplemented
+        try:
+            other_starts, other_ends = other._as_arrays()
+        except TypeError:
+            # integer times are never equal to the datetimes of an array.
+            return False
+        return (
+            self._utc == other.is_utc
+            and np.array_equal(self.starts, other_starts)
+            and np.array_equal(self.ends, other_ends)
+        )
+
+    def append(self, time_interval):
+        """Appends a time interval(s) to the Time_Set."""
+        if isinstance(time_interval, Time_Interval):
+            time_interval = [time_interval]
+        if isinstance(time_interval, list):
+            self.validate_list_of_time_intervals(time_interval)
+            time_interval = Time_Set(time_interval)
+        other = Array_Time_Set.from_time_set(time_interval)
+        if len(self):
+            _check_tz(other, self._utc)
+
+        starts = np.concatenate([self.starts, other.starts])
+        ends = np.concatenate([self.ends, other.ends])
+        order = np.argsort(starts, kind="stable")
+        return Array_Time_Set._from_sorted(
+            starts[order], ends[order], self._utc or other.is_utc
+        )
+
+    @_cached_result
+    def compute_intersection(self):
+        """Computes the intersection of this Time_Set.
+
+        The intersection of every time interval is the latest start to the
+        earliest end, or None if that is empty.
+        """
+        if len(self.starts) == 0:
+            return None
+        start, end = self.starts.max(), self.ends.min()
+        if start >= end:
+            return None
+        start, end = _datetimes_from_array(np.array([start, end]), self._utc)
+        return Time_Interval._unchecked(start, end)
+
+    def _wrap_normalized_arrays(self, starts, ends, utc: bool = None):
+        """Returns a normalized Array_Time_Set wrapping datetime64 arrays."""
+        return Array_Time_Set._from_normalized(
+            starts, ends, self._utc if utc is None else utc
+        )
+
+    @_cached_result
+    def compute_union(self, workers: int = None):
+        """Computes the union of this Time_Set.
+
+        The vectorized form of Time_Set.compute_union(): a running maximum of
+        the end times marks every start that begins after all earlier time
+        intervals ended as the start of a new block.
+
+        Parameters:
+            workers : int - if more than one, the arrays are split into chunks
+                that are merged in a pool of this many processes.
+        """
+        if self.is_normalized:
+            return self
+        if workers is not None and workers > 1:
+            return self._wrap_normalized_arrays(
+                *_parallel_union_arrays(self.starts, self.ends, workers)
+            )
+        return self._wrap_normalized_arrays(*_union_arrays(self.starts, self.ends))
+
+
+class Incremental_Time_Set(Time_Set):
+    """A Time_Set that keeps its union up to date as time intervals are added.
+
+    Unlike the other Time_Sets, an Incremental_Time_Set is changed in place:
+    add() and remove() update a sorted list of merged start and end times, so
+    it is always normalized and compute_union() never has to run again. Each
+    change bisects for the merged neighbours and replaces them with a single
+    slice assignment, costing O(log n) comparisons plus the number of
+    neighbours merged (the slice assignment itself is a memmove).
+    """
+
+    # changed in place, so it can be neither hashed nor cached.
+    __hash__ = None
+
+    def __init__(self, time_intervals: list = None):
+        """Constructs an Incremental_Time_Set from Time_Interval objects."""
+        self.starts = []
+        self.ends = []
+        self.is_normalized = True
+        self._cache = {}
+        self._time_intervals = None
+        for time_interval in time_intervals or []:
+            self.add(time_interval)
+
+    @property
+    def time_intervals(self) -> list:
+        """The merged time intervals, built on first access after a change."""
+        if self._time_intervals is None:
+            self._time_intervals = [
+                Time_Interval._unchecked(start, end)
+                for start, end in zip(self.starts, self.ends)
+            ]
+        return self._time_intervals
+
+    def __len__(self):
+        """Returns the number of merged time intervals."""
+        return len(self.starts)
+
+    def add(self, time_interval):
+        """Adds a time interval, merging it with any it overlaps or touches."""
+        self.validate_list_of_time_intervals([time_interval])
+        start, end = time_interval.start, time_interval.end
+        first = bisect.bisect_left(self.ends, start)
+        last = bisect.bisect_right(self.starts, end)
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+        self._changed()
+
+    def remove(self, time_interval):
+        """Removes the time covered by a time interval, splitting if needed."""
+        self.validate_list_of_time_intervals([time_interval])
+        start, end = time_interval.start, time_interval.end
+        first = bisect.bisect_right(self.ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        if first >= last:
+            return
+        starts, ends = [], []
+        if self.starts[first] < start:
+            starts.append(self.starts[first])
+            ends.append(start)
+        if self.ends[last - 1] > end:
+            starts.append(end)
+            ends.append(self.ends[last - 1])
+        self.starts[first:last] = starts
+        self.ends[first:last] = ends
+        self._changed()
+
+    def _changed(self):
+        """Drops the cached time intervals and index after a change."""
+        self._time_intervals = None
+        self._cache = {}
+
+    def compute_union(self, workers: int = None):
+        """Returns a snapshot of the union, which is always up to date."""
+        return Time_Set._from_normalized(list(self.time_intervals))
+
+
+# How each set operator decides which time to keep, for Time_Set.merge_sweep().
+_SET_OPERATIONS = {
+    "|": lambda in_self, in_other: in_self or in_other,
+    "&": lambda in_self, in_other: in_self and in_other,
+    "-": lambda in_self, in_other: in_self and not in_other,
+    "^": lambda in_self, in_other: in_self != in_other,
+}
+
+
+# The most time intervals, counting operands and results, that the cache of
+# set operations holds. Its entries are kept least recently used first.
+SET_OPERATION_CACHE_INTERVALS = 1_000_000
+_set_operation_cache = collections.OrderedDict()
+_set_operation_cache_intervals = 0
+
+
+def _cached_set_operation(time_set, other, symbol: str):
+    """Returns time_set <symbol> other, caching the most recent results.
+
+    The least recently used results are dropped once the cached operands and
+    results hold more than SET_OPERATION_CACHE_INTERVALS time intervals, and
+    a result bigger than that on its own is not cached at all.
+    """
+    global _set_operation_cache_intervals
+    # equal Time_Sets of different kinds hash alike, but give results of
+    # different kinds, so the kinds are part of the key.
+    key = (type(time_set), time_set, type(other), other, symbol)
+    if key in _set_operation_cache:
+        _set_operation_cache.move_to_end(key)
+        return _set_operation_cache[key][0]
+
+    result = time_set.merge_sweep(other, _SET_OPERATIONS[symbol])
+    intervals = len(time_set) + len(other) + len(result)
+    if intervals <= SET_OPERATION_CACHE_INTERVALS:
+        _set_operation_cache[key] = (result, intervals)
+        _set_operation_cache_intervals += intervals
+        while _set_operation_cache_intervals > SET_OPERATION_CACHE_INTERVALS:
+            _, (_, dropped) = _set_operation_cache.popitem(last=False)
+            _set_operation_cache_intervals -= dropped
+    return result
+
+
+def clear_cache():
+    """Empties the cache of set operations between Time_Sets."""
+    global _set_operation_cache_intervals
+    _set_operation_cache.clear()
+    _set_operation_cache_intervals = 0
+
+
+def _union_arrays(starts, ends):
+    """Merges start-sorted start and end arrays into their sorted, disjoint union."""
+    if len(starts) == 0:
+        return starts, ends
+    latest_ends = np.maximum.accumulate(ends)
+    new_block = np.empty(len(starts), dtype=bool)
+    new_block[0] = True
+    np.greater(starts[1:], latest_ends[:-1], out=new_block[1:])
+    block_starts = np.flatnonzero(new_block)
+    block_ends = np.append(block_starts[1:], len(starts)) - 1
+    return starts[block_starts], latest_ends[block_ends]
+
+
+def _parallel_union_arrays(starts, ends, workers: int):
+    """Merges start-sorted arrays into their union using a pool of processes.
+
+    The arrays are split into one contiguous chunk per worker and each chunk
+    is merged with _union_arrays(). Since the chunks follow the sorted order,
+    their results concatenate in start order, and a final _union_arrays()
+    stitches together blocks that overlap or touch across chunk boundaries.
+    The start and end times are shared with the workers through shared
+    memory where it is available, rather than pickled.
+    """
+    bounds = np.linspace(0, len(starts), workers + 1).astype(int)
+    chunks = list(zip(bounds[:-1], bounds[1:]))
+
+    with ProcessPoolExecutor(workers) as pool:
+        if shared_memory is None:
+            parts = list(
+                pool.map(
+                    _union_arrays,
+                    [starts[lo:hi] for lo, hi in chunks],
+                    [ends[lo:hi] for lo, hi in chunks],
+                )
+            )
+        else:
+            block = shared_memory.SharedMemory(
+                create=True, size=max(1, starts.nbytes * 2)
+            )
+            try:
+                shared = np.ndarray((2, len(starts)), dtype=np.int64, buffer=block.buf)
+                shared[0] = starts.view(np.int64)
+                shared[1] = ends.view(np.int64)
+                del shared
+                parts = list(
+                    pool.map(
+                        _union_shared_chunk,
+                        itertools.repeat(block.name),
+                        itertools.repeat(len(starts)),
+                        *zip(*chunks),
+                    )
+                )
+            finally:
+                block.close()
+                block.unlink()
+
+    chunk_starts = np.concatenate([part[0] for part in parts]).astype("datetime64[ns]")
+    chunk_ends = np.concatenate([part[1] for part in parts]).astype("datetime64[ns]")
+    return _union_arrays(chunk_starts, chunk_ends)
+
+
+def _union_shared_chunk(name: str, length: int, lo: int, hi: int):
+    """Merges one chunk of the start and end times held in shared memory."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        shared = np.ndarray((2, length), dtype=np.int64, buffer=block.buf)
+        starts, ends = _union_arrays(shared[0, lo:hi].copy(), shared[1, lo:hi].copy())
+        del shared
+        return starts, ends
+    finally:
+        block.close()
+
+
+def _time_intervals_from_arrays(starts, ends, utc: bool = False) -> list:
+    """Builds Time_Intervals from valid, datetime64 start and end arrays.
+
+    If utc, the arrays hold naive UTC times and the Time_Intervals are tz-aware.
+    """
+    return [
+        Time_Interval._unchecked(start, end)
+        for start, end in zip(
+            _datetimes_from_array(starts, utc), _datetimes_from_array(ends, utc)
+        )
+    ]
+
+
+def _datetimes_from_array(times, utc: bool = False) -> list:
+    """Returns a datetime64 array as datetimes, tz-aware in UTC if utc is set.
+
+    Adding each time's offset from the epoch to a UTC epoch builds tz-aware
+    datetimes without a timezone conversion per element. datetime.datetime
+    only holds microseconds, so if any time has nanoseconds they are all
+    returned as pd.Timestamps instead.
+    """
+    times = times.astype("datetime64[ns]", copy=False)
+    if np.any(times.view(np.int64) % 1000):
+        times = pd.DatetimeIndex(times)
+        return (times.tz_localize("UTC") if utc else times).tolist()
+    times = times.astype("datetime64[us]")
+    if not utc:
+        return times.tolist()
+    offsets = times.view(np.int64).astype("timedelta64[us]").tolist()
+    return [_UTC_EPOCH + offset for offset in offsets]
+
+
+def merge_streams(*streams):
+    """Merges start-ordered streams of time intervals into one, lazily.
+
+    Each stream is any iterable of Time_Intervals or (start, end) tuples that
+    is ordered by start time; only one time interval per stream is held in
+    memory at a time.
+    """
+    return heapq.merge(
+        *(map(_as_time_interval, stream) for stream in streams),
+        key=lambda time_interval: time_interval.start,
+    )
+
+
+def iter_union(*streams):
+    """Yields the union of start-ordered streams of time intervals.
+
+    The streaming form of Time_Set.compute_union(): each merged time interval
+    is yielded as soon as a later one starts after it ends, so memory use is
+    constant no matter how long the streams are.
+    """
+    sweep = Union_Sweep()
+    for time_interval in merge_streams(*streams):
+        merged = sweep.push(time_interval)
+        if merged is not None:
+            yield merged
+    merged = sweep.finish()
+    if merged is not None:
+        yield merged
+
+
+class Union_Sweep:
+    """The running state of a union over start-ordered time intervals.
+
+    Time intervals are pushed one at a time; each push returns the merged
+    time interval that it proved final, if any, and finish() returns the
+    last one. Only the current block is held in memory.
+    """
+
+    def __init__(self):
+        """Creates an empty sweep."""
+        self.block = None
+        self.latest_end = None
+
+    def push(self, time_interval):
+        """Adds the next time interval, returning a finished one or None."""
+        block = self.block
+        if block is None:
+            self.block, self.latest_end = time_interval, time_interval.end
+            return None
+        if time_interval.start < block.start:
+            raise ValueError(
+                "Time intervals in a stream must be ordered by start time."
+            )
+        if time_interval.start <= self.latest_end:
+            if time_interval.end > self.latest_end:
+                self.latest_end = time_interval.end
+            return None
+        merged = self.finish()
+        self.block, self.latest_end = time_interval, time_interval.end
+        return merged
+
+    def finish(self):
+        """Returns the block being merged, or None if nothing was pushed."""
+        block = self.block
+        if block is None or self.latest_end == block.end:
+            return block
+        return Time_Interval._unchecked(block.start, self.latest_end)
+
+
+async def aiter_union(
+    *sources,
+    start_column: str = "start",
+    end_column: str = "end",
+    time_format: str = None,
+    chunk_size: int = 100_000,
+):
+    """Asynchronously yields the union of several start-ordered sources.
+
+    The sources are read concurrently and merged with a running union, so
+    only one chunk per file and one time interval per async source are held
+    in memory at a time. Every source must be ordered by start time.
+
+    Parameters:
+        sources : str, os.PathLike or async iterable - a CSV (".csv"), JSON
+            lines (".jsonl", ".ndjson") or JSON (".json") file with start and
+            end columns, or an async iterable of Time_Intervals or (start, end)
+            tuples. A JSON file holds a single array of records, so it is
+            parsed whole before it is split into chunks.
+        start_column, end_column, time_format : see Time_Set.from_dataframe().
+        chunk_size : int - the number of rows to read and parse at a time.
+    """
+    streams = [
+        (
+            _aiter_file(source, start_column, end_column, time_format, chunk_size)
+            if isinstance(source, (str, os.PathLike))
+            else source.__aiter__()
+        )
+        for source in sources
+    ]
+    heads = []
+    await asyncio.gather(
+        *(_push_next(heads, ix, stream) for ix, stream in enumerate(streams))
+    )
+
+    sweep = Union_Sweep()
+    while heads:
+        _, ix, time_interval = heapq.heappop(heads)
+        merged = sweep.push(time_interval)
+        if merged is not None:
+            yield merged
+        await _push_next(heads, ix, streams[ix])
+    merged = sweep.finish()
+    if merged is not None:
+        yield merged
+
+
+async def aload_union(*sources, **kwargs) -> Time_Set:
+    """Returns the union of several sources as a normalized Time_Set.
+
+    Takes the same arguments as aiter_union().
+    """
+    return Time_Set._from_normalized(
+        [time_interval async for time_interval in aiter_union(*sources, **kwargs)]
+    )
+
+
+async def _push_next(heads: list, ix: int, stream):
+    """Pushes the next time interval of a stream onto the merge heap."""
+    try:
+        time_interval = _as_time_interval(await stream.__anext__())
+    except StopAsyncIteration:
+        return
+    heapq.heappush(heads, (time_interval.start, ix, time_interval))
+
+
+async def _aiter_file(path, start_column, end_column, time_format, chunk_size):
+    """Asynchronously yields the time intervals of a CSV or JSON (lines) file.
+
+    The file is opened, and chunks are read and parsed in bulk, in a worker
+    thread, and the next chunk is already being read while the current one
+    is consumed.
+    """
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix not in (".csv", ".jsonl", ".ndjson", ".json"):
+        raise ValueError("Unsupported file type " + str(path) + ".")
+
+    def open_reader():
+        if suffix == ".csv":
+            return pd.read_csv(path, chunksize=chunk_size)
+        if suffix in (".jsonl", ".ndjson"):
+            return pd.read_json(
+                path, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False
+            )
+        dataframe = pd.read_json(path, dtype=False, convert_dates=False)
+        return contextlib.nullcontext(
+            dataframe.iloc[ix : ix + chunk_size]
+            for ix in range(0, len(dataframe), chunk_size)
+        )
+
+    def read_chunk():
+        chunk = next(reader, None)
+        if chunk is None:
+            return None
+        return _dataframe_to_arrays(
+            chunk, start_column, end_column, time_format, "raise"
+        )
+
+    with await asyncio.to_thread(open_reader) as reader:
+        pending = asyncio.ensure_future(asyncio.to_thread(read_chunk))
+        try:
+            while True:
+                arrays = await pending
+                if arrays is None:
+                    return
+                pending = asyncio.ensure_future(asyncio.to_thread(read_chunk))
+                for time_interval in _time_intervals_from_arrays(*arrays):
+                    yield time_interval
+        finally:
+            # let a read that is still running finish before the file closes.
+            await asyncio.gather(pending, return_exceptions=True)
+
+
+def iter_intersection(*streams):
+    """Yields the intersection of start-ordered streams of time intervals.
+
+    The streaming form of Time_Set.compute_intersection(): the intersection
+    of every time interval is the latest start to the earliest end, so only
+    those two are kept. Since the time intervals arrive in start order, the
+    intersection is empty as soon as one starts at or after the earliest end,
+    and the streams are not read any further. Yields a single time interval
+    once the streams are exhausted, or nothing if the intersection is empty.
+    """
+    latest_start = earliest_end = None
+    for time_interval in merge_streams(*streams):
+        if latest_start is not None and time_interval.start < latest_start:
+            raise ValueError(
+                "Time intervals in a stream must be ordered by start time."
+            )
+        if earliest_end is not None and time_interval.start >= earliest_end:
+            return
+        latest_start = time_interval.start
+        if earliest_end is None or time_interval.end < earliest_end:
+            earliest_end = time_interval.end
+    if latest_start is not None:
+        yield Time_Interval._unchecked(latest_start, earliest_end)
+
+
+def iter_common_time(*streams):
+    """Yields the time covered by every one of two or more start-ordered streams.
+
+    Unlike iter_intersection(), this intersects the streams with each other:
+    each stream is first merged with iter_union(), then the current time
+    interval of every stream is intersected and the one that ends first is
+    advanced, so each result is yielded as soon as it is final.
+    """
+    if len(streams) < 2:
+        raise ValueError("At least two streams are needed to find their common time.")
+    unions = [iter_union(stream) for stream in streams]
+    heads = [next(union, None) for union in unions]
+
+    while all(head is not None for head in heads):
+        latest_start = max(head.start for head in heads)
+        earliest_end = min(head.end for head in heads)
+        if latest_start < earliest_end:
+            yield Time_Interval._unchecked(latest_start, earliest_end)
+        for ix, head in enumerate(heads):
+            if head.end == earliest_end:
+                heads[ix] = next(unions[ix], None)
+
+
+def _as_utc(start, end):
+    """Converts a tz-aware start time, and the end if it is tz-aware, to UTC.
+
+    A naive end is left as it is, so that comparing it with the start raises.
+    """
+    start = start.astimezone(timezone.utc)
+    if getattr(end, "tzinfo", None) is not None:
+        end = end.astimezone(timezone.utc)
+    return start, end
+
+
+def _as_time_interval(time_interval):
+    """Returns a Time_Interval, building one from a (start, end) tuple."""
+    if isinstance(time_interval, Time_Interval):
+        return time_interval
+    return Time_Interval(*time_interval)
+
+
+# ISO-8601 formats that datetime.fromisoformat() parses, with their length.
+_ISO_TIME_FORMATS = {
+    "%Y-%m-%d": 10,
+    "%Y-%m-%d %H:%M": 16,
+    "%Y-%m-%dT%H:%M": 16,
+    "%Y-%m-%d %H:%M:%S": 19,
+    "%Y-%m-%dT%H:%M:%S": 19,
+}
+
+# The numeric strptime directives the regular expression parser handles, with
+# their position in the datetime constructor and the same pattern strptime uses.
+_NUMERIC_DIRECTIVES = {
+    "Y": (0, r"(\d\d\d\d)"),
+    "m": (1, r"(1[0-2]|0[1-9]|[1-9])"),
+    "d": (2, r"(3[01]|[12]\d|0[1-9]|[1-9]| [1-9])"),
+    "H": (3, r"(2[0-3]|[0-1]\d|\d)"),
+    "M": (4, r"([0-5]\d|\d)"),
+    "S": (5, r"(6[0-1]|[0-5]\d|\d)"),
+    "f": (6, r"(\d{1,6})"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_time_format(time_format: str):
+    """Returns a function that parses strings in time_format to datetimes.
+
+    ISO-8601 formats are parsed with datetime.fromisoformat(), and formats
+    made only of numeric directives with a regular expression compiled once.
+    Anything else, or any string the fast parser rejects, goes through
+    datetime.strptime, so results and errors match it exactly.
+    """
+    if time_format in _ISO_TIME_FORMATS:
+        length = _ISO_TIME_FORMATS[time_format]
+        # fromisoformat() accepts more than the format, such as fractions and
+        # offsets, so the separators must also be where the format puts them.
+        shape = re.sub("%[mdHMS]", "00", time_format.replace("%Y", "0000"))
+        positions = [ix for ix, c in enumerate(shape) if c != "0"]
+        get_separators = operator.itemgetter(*positions, positions[0])
+        separators = get_separators(shape)
+
+        def parse(text: str) -> datetime:
+            if len(text) == length and get_separators(text) == separators:
+                try:
+                    return datetime.fromisoformat(text)
+                except ValueError:
+                    pass
+            return datetime.strptime(text, time_format)
+
+        return parse
+
+    compiled = _compile_numeric_time_format(time_format)
+    if compiled is None:
+        return lambda text: datetime.strptime(text, time_format)
+    pattern, positions = compiled
+
+    def parse(text: str) -> datetime:
+        match = pattern.fullmatch(text)
+        if match is not None:
+            fields = [1900, 1, 1, 0, 0, 0, 0]
+            for position, value in zip(positions, match.groups()):
+                fields[position] = int(value.ljust(6, "0") if position == 6 else value)
+            try:
+                return datetime(*fields)
+            except ValueError:
+                pass
+        return datetime.strptime(text, time_format)
+
+    return parse
+
+
+def _compile_numeric_time_format(time_format: str):
+    """Returns a regular expression and field positions for a time format.
+
+    Returns None if the format uses a directive other than the numeric ones,
+    or uses one twice.
+    """
+    parts = re.split(r"(%.)", time_format)
+    pattern = ""
+    positions = []
+    for ix, part in enumerate(parts):
+        if ix % 2 == 0:
+            pattern += r"\s+".join(re.escape(piece) for piece in re.split(r"\s+", part))
+        elif part == "%%":
+            pattern += "%"
+        elif part[1] in _NUMERIC_DIRECTIVES:
+            position, directive_pattern = _NUMERIC_DIRECTIVES[part[1]]
+            if position in positions:
+                return None
+            positions.append(position)
+            pattern += directive_pattern
+        else:
+            return None
+    return re.compile(pattern, re.IGNORECASE), positions
+
+
+def _covered_before(union_starts, union_ends, times):
+    """Returns the time a normalized union covers before each time, in ns."""
+    starts = union_starts.view(np.int64)
+    lengths = union_ends.view(np.int64) - starts
+    covered = np.concatenate([[0], np.cumsum(lengths)])
+    times = times.view(np.int64)
+
+    last = np.searchsorted(starts, times, side="right") - 1
+    inside = np.clip(times - starts[last], 0, lengths[last]) if len(starts) else 0
+    return np.where(last >= 0, covered[last] + inside, 0)
+
+
+def _bucket_edges(union_starts, union_ends, freq: str, start, end, tz=None):
+    """Returns the bucket edges for coverage(), as datetime64[ns] and as an index.
+
+    If tz is given, the union holds naive UTC times, the buckets follow the
+    calendar of tz and the returned datetime64[ns] edges are naive UTC times.
+    """
+
+    def as_timestamp(time):
+        time = pd.Timestamp(time)
+        if tz is None:
+            return time
+        if time.tzinfo is None:
+            time = time.tz_localize("UTC")
+        return time.tz_convert(tz)
+
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if start is None or end is None:
+        if len(union_starts) == 0:
+            raise ValueError("The start and end are required for an empty Time_Set.")
+    if start is None:
+        first = as_timestamp(union_starts[0])
+        if isinstance(offset, (pd.offsets.Tick, pd.offsets.Day)):
+            # Floor to the same side of a DST fold as the first start.
+            first = first.floor(
+                offset, ambiguous=bool(first.dst()), nonexistent="shift_backward"
+            )
+        else:
+            first = offset.rollback(first.normalize())
+    else:
+        first = as_timestamp(start)
+    stop = as_timestamp(union_ends[-1] if end is None else end)
+    if stop <= first:
+        raise ValueError("The end must be after the start.")
+
+    edges = pd.date_range(first, stop + offset, freq=offset)
+    if edges[0] > first:
+        edges = edges.insert(0, first)
+    edges = edges[: np.searchsorted(edges, stop) + 1]
+    if end is not None:
+        edges = edges[:-1].append(pd.DatetimeIndex([stop]))
+    if tz is not None:
+        return edges.tz_convert(None).to_numpy().astype("datetime64[ns]"), edges
+    return edges.to_numpy().astype("datetime64[ns]"), edges
+
+
+def _to_datetime64(times):
+    """Returns a list, array or Series of times as a datetime64[ns] array.
+
+    tz-aware times are returned as naive UTC times.
+    """
+    if isinstance(times, np.ndarray) and times.dtype.kind == "M":
+        return times.astype("datetime64[ns]", copy=False)
+    utc_times = _to_utc_datetime64(times)
+    if utc_times is not None:
+        return utc_times
+    return np.asarray(pd.to_datetime(times), dtype="datetime64[ns]")
+
+
+def _to_utc_datetime64(times):
+    """Returns tz-aware times as naive UTC datetime64[ns], or None if naive.
+
+    The times are converted in one vectorized step rather than one timezone
+    conversion per time; a tz-aware datetime64[ns] Series or index in UTC is
+    returned without a copy.
+    """
+    if isinstance(getattr(times, "dtype", None), pd.DatetimeTZDtype):
+        utc_times = pd.DatetimeIndex(times).tz_convert(None)
+        return utc_times.to_numpy().astype("datetime64[ns]", copy=False)
+    if isinstance(times, np.ndarray) and times.dtype != object:
+        return None
+    first = next(iter(times), None)
+    if getattr(first, "tzinfo", None) is None:
+        return None
+    return _to_utc_datetime64(pd.to_datetime(times, utc=True))
+
+
+def _check_tz(time_set, utc: bool):
+    """Raises if a non-empty Time_Set and some times are not both tz-aware or naive."""
+    if len(time_set) and time_set.is_utc != utc:
+        raise TypeError("Cannot compare tz-aware and naive times.")
+
+
+def _column_to_datetime64(column: pd.Series, time_format: str, tz=None):
+    """Returns a column as datetime64[ns], and whether it is in UTC.
+
+    Strings are parsed in bulk. tz-aware columns, and naive ones when tz is
+    given, are converted to naive UTC times in one vectorized step. Datetime
+    columns are returned without a copy when already naive nanoseconds.
+    Values that cannot be parsed, or that do not exist or are ambiguous in
+    tz, become NaT.
+    """
+    if column.dtype.kind != "M":
+        try:
+            column = pd.to_datetime(column, format=time_format, errors="coerce")
+        except ValueError:
+            # times with different UTC offsets can only be parsed to UTC.
+            column = pd.to_datetime(
+                column, format=time_format, errors="coerce", utc=True
+            )
+    utc_times = _to_utc_datetime64(column)
+    if utc_times is not None:
+        return utc_times, True
+    times = column.to_numpy().astype("datetime64[ns]", copy=False)
+    if tz is None:
+        return times, False
+    local_times = pd.DatetimeIndex(times).tz_localize(
+        tz, ambiguous="NaT", nonexistent="NaT"
+    )
+    return _to_utc_datetime64(local_times), True
+
+
+def _dataframe_to_arrays(
+    dataframe, start_column, end_column, time_format, errors, tz=None
+):
+    """Returns validated start and end arrays from two dataframe columns.
+
+    Every row is checked at once; bad rows are either all reported in a
+    single ValueError or, when errors is "drop", skipped with a warning.
+    Also returns whether the arrays hold the naive UTC times of tz-aware
+    columns, or of naive columns in tz.
+    """
+    starts, ends, utc, _ = _dataframe_to_arrays_and_mask(
+        dataframe, start_column, end_column, time_format, errors, tz
+    )
+    return starts, ends, utc
+
+
+def _dataframe_to_arrays_and_mask(
+    dataframe, start_column, end_column, time_format, errors, tz=None
+):
+    """Like _dataframe_to_arrays(), but also returns a mask of the kept rows."""
+    if errors not in ("raise", "drop"):
+        raise ValueError('errors must be either "raise" or "drop".')
+    starts, start_utc = _column_to_datetime64(dataframe[start_column], time_format, tz)
+    ends, end_utc = _column_to_datetime64(dataframe[end_column], time_format, tz)
+    if start_utc != end_utc:
+        raise ValueError(
+            "Start and end times must either both be tz-aware or both be naive."
+        )
+
+    bad = np.isnat(starts) | np.isnat(ends) | (starts >= ends)
+    if not bad.any():
+        return starts, ends, start_utc, ~bad
+
+    message = (
+        str(int(bad.sum()))
+        + " row(s) with a missing or unparsable time, or with an end time that"
+        + " is not after the start time: "
+        + str(list(dataframe.index[bad]))
+    )
+    if errors == "raise":
+        raise ValueError("Found " + message)
+    warnings.warn("Dropping " + message)
+    return starts[~bad], ends[~bad], start_utc, ~bad
+
+
+def _group_codes(dataframe, by: str, kept):
+    """Returns integer group codes for the kept rows and the group keys."""
+    codes, keys = pd.factorize(dataframe[by].to_numpy()[kept], sort=True)
+    if np.any(codes < 0):
+        raise ValueError("The " + str(by) + " column must not have missing keys.")
+    return codes, keys
+
+
+# The methods enable_profiling() instruments. They are wrapped only while
+# profiling is enabled, so there is no overhead otherwise.
+_PROFILED_METHODS = [
+    (Time_Set, "from_dataframe"),
+    (Time_Set, "from_string_pairs"),
+    (Time_Set, "compute_union"),
+    (Time_Set, "compute_intersection"),
+    (Time_Set, "merge_sweep"),
+    (Time_Set, "contains_many"),
+    (Time_Set, "coverage"),
+    (Time_Set, "depth_profile"),
+    (Array_Time_Set, "from_dataframe"),
+    (Array_Time_Set, "compute_union"),
+    (Array_Time_Set, "compute_intersection"),
+    (Time_Interval, "from_strings"),
+    (Time_Interval, "from_string_pairs"),
+    (Time_Interval, "__sub__"),
+    (Time_Interval, "intersection"),
+    (Time_Interval, "union"),
+]
+_profile = {}
+_profiled_originals = {}
+
+
+def enable_profiling():
+    """Starts recording calls, time and time intervals for the hot methods.
+
+    See get_profile() for what is recorded. Time is inclusive, so an
+    operation that calls another, like | calling compute_union(), counts the
+    time of both.
+    """
+    for cls, name in _PROFILED_METHODS:
+        if (cls, name) not in _profiled_originals:
+            original = cls.__dict__[name]
+            _profiled_originals[(cls, name)] = original
+            setattr(cls, name, _profiled(cls.__name__ + "." + name, original))
+
+
+def disable_profiling():
+    """Stops recording, keeping what was recorded so far."""
+    for (cls, name), original in _profiled_originals.items():
+        setattr(cls, name, original)
+    _profiled_originals.clear()
+
+
+def reset_profile():
+    """Forgets everything recorded so far."""
+    _profile.clear()
+
+
+def get_profile() -> dict:
+    """Returns what has been recorded per operation since the last reset.
+
+    Each operation, such as "Time_Set.compute_union", maps to a dict with
+    the number of "calls", the total "seconds" spent, and the number of
+    "intervals" processed: the time intervals in the Time_Set and
+    Time_Interval arguments, or in the result when there are none.
+    """
+    return {operation: dict(record) for operation, record in _profile.items()}
+
+
+def _profiled(operation: str, method):
+    """Wraps a method, or classmethod, so that its calls are recorded."""
+    if isinstance(method, classmethod):
+        return classmethod(_profiled(operation, method.__func__))
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        begin = time.perf_counter()
+        result = method(*args, **kwargs)
+        seconds = time.perf_counter() - begin
+
+        intervals = sum(_count_time_intervals(arg) for arg in args)
+        if intervals == 0:
+            intervals = _count_time_intervals(result)
+        record = _profile.setdefault(
+            operation, {"calls": 0, "seconds": 0.0, "intervals": 0}
+        )
+        record["calls"] += 1
+        record["seconds"] += seconds
+        record["intervals"] += intervals
+        return result
+
+    return wrapper
+
+
+def _count_time_intervals(value) -> int:
+    """Returns how many time intervals a value holds, for the profile."""
+    if isinstance(value, Time_Interval):
+        return 1
+    if isinstance(value, Time_Set):
+        return len(value)
+    if isinstance(value, list) and value and isinstance(value[0], Time_Interval):
+        return len(value)
+    return 0
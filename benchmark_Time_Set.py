@@ -0,0 +1,249 @@
+"""Benchmarks for Time_Set hot paths.
+
+Times each operation over several distributions of time intervals and sizes,
+printing a table, or JSON with --json for comparing runs with --compare.
+
+Run with: python benchmark_Time_Set.py [--max-size 10000000] [--json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+from Time_Set import Array_Time_Set
+from Time_Set import Time_Set
+from Time_Set import Time_Interval
+from Time_Set import clear_cache
+
+SIZES = [10**2, 10**3, 10**4, 10**5, 10**6, 10**7]
+EPOCH = np.datetime64("2022-08-01T00:00", "ns")
+MINUTE = np.timedelta64(1, "m")
+
+
+def random_minutes(n: int, rng) -> tuple:
+    """Time intervals of 1 to 120 minutes starting anywhere in n hours."""
+    starts = rng.integers(0, n * 60, n)
+    return starts, starts + rng.integers(1, 120, n)
+
+
+def nested_minutes(n: int, rng) -> tuple:
+    """Time intervals that are each nested in the one before them."""
+    starts = np.arange(n)
+    return starts, 2 * n - starts
+
+
+def disjoint_minutes(n: int, rng) -> tuple:
+    """Time intervals with a gap between every one of them."""
+    starts = np.arange(n) * 3
+    return starts, starts + rng.integers(1, 3, n)
+
+
+def adjacent_minutes(n: int, rng) -> tuple:
+    """Time intervals that each end exactly where the next starts."""
+    starts = np.arange(n) * 2
+    return starts, starts + 2
+
+
+DISTRIBUTIONS = {
+    "random": random_minutes,
+    "nested": nested_minutes,
+    "disjoint": disjoint_minutes,
+    "adjacent": adjacent_minutes,
+}
+
+
+def make_arrays(distribution: str, n: int, seed: int = 0) -> tuple:
+    """Returns shuffled datetime64[ns] start and end arrays of a distribution."""
+    rng = np.random.default_rng(seed)
+    starts, ends = DISTRIBUTIONS[distribution](n, rng)
+    order = rng.permutation(n)
+    return EPOCH + starts[order] * MINUTE, EPOCH + ends[order] * MINUTE
+
+
+def random_time_intervals(n: int, seed: int = 0) -> list:
+    """Returns n random Time_Intervals spread over roughly n hours."""
+    return list(Array_Time_Set(*make_arrays("random", n, seed)))
+
+
+def time_call(function, setup=None, repeat: int = 3) -> float:
+    """Returns the best wall-clock time in seconds of repeat calls.
+
+    If given, setup() is called untimed before each call and its result is
+    passed to function, so every call starts from a fresh input.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        begin = time.perf_counter()
+        function() if setup is None else function(argument)
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def operations(starts, ends) -> dict:
+    """Returns (setup, function) pairs for every benchmarked operation."""
+    time_intervals = list(Array_Time_Set._from_sorted(starts, ends))
+    half = len(time_intervals) // 2
+    strings = [
+        (i.start.strftime("%m/%d/%Y %H:%M"), i.end.strftime("%m/%d/%Y %H:%M"))
+        for i in time_intervals
+    ]
+    pairs = list(zip(time_intervals, time_intervals[1:]))
+    return {
+        "Time_Set.__init__": (None, lambda: Time_Set(time_intervals)),
+        "Time_Set.compute_union": (
+            lambda: Time_Set(time_intervals),
+            lambda time_set: time_set.compute_union(),
+        ),
+        "Time_Set.compute_intersection": (
+            lambda: Time_Set(time_intervals),
+            lambda time_set: time_set.compute_intersection(),
+        ),
+        "Time_Set.__or__": (
+            lambda: (
+                clear_cache(),
+                Time_Set(time_intervals[:half]),
+                Time_Set(time_intervals[half:]),
+            )[1:],
+            lambda time_sets: time_sets[0] | time_sets[1],
+        ),
+        "Time_Interval.__sub__": (None, lambda: [a - b for a, b in pairs]),
+        "Time_Interval.from_strings": (
+            None,
+            lambda: [Time_Interval.from_strings(a, b) for a, b in strings],
+        ),
+        "Time_Interval.from_string_pairs": (
+            None,
+            lambda: Time_Interval.from_string_pairs(*zip(*strings)) if strings else [],
+        ),
+        "Array_Time_Set.compute_union": (
+            lambda: Array_Time_Set(starts, ends),
+            lambda time_set: time_set.compute_union(),
+        ),
+    }
+
+
+def run(sizes: list, distributions: list, selected: list, repeat: int):
+    """Runs the benchmarks, yielding one result dict per measurement."""
+    for distribution in distributions:
+        for n in sizes:
+            starts, ends = make_arrays(distribution, n)
+            for operation, (setup, function) in operations(starts, ends).items():
+                if selected and operation not in selected:
+                    continue
+                seconds = time_call(function, setup, repeat)
+                yield {
+                    "operation": operation,
+                    "distribution": distribution,
+                    "n": n,
+                    "seconds": seconds,
+                    "ns_per_interval": seconds / n * 1e9,
+                }
+
+
+class Dict_Time_Interval:
+    """The previous Time_Interval layout: a __dict__ and an eager time_elapsed."""
+
+    def __init__(self, start, end):
+        if start > end:
+            raise ValueError("End time is before start time.")
+        if start == end:
+            raise ValueError("End time is equal to start time.")
+        self.start = start
+        self.end = end
+        self.time_elapsed = end - start
+
+
+def benchmark_time_interval(n: int = 10**6):
+    """Prints the memory and construction speed of Time_Interval layouts."""
+    epoch = datetime(2022, 8, 1)
+    times = [epoch + timedelta(minutes=m) for m in range(n + 1)]
+    nanoseconds = [m * 60 * 10**9 for m in range(n + 1)]
+    print(f"{'layout':>28} {'bytes / interval':>17} {'ns / interval':>14}")
+    for name, build in [
+        (
+            "__dict__ (previous)",
+            lambda: [Dict_Time_Interval(a, b) for a, b in zip(times, times[1:])],
+        ),
+        ("__slots__", lambda: [Time_Interval(a, b) for a, b in zip(times, times[1:])]),
+        (
+            "__slots__, unchecked",
+            lambda: [Time_Interval._unchecked(a, b) for a, b in zip(times, times[1:])],
+        ),
+        (
+            "__slots__, epoch ns",
+            lambda: [Time_Interval(a, b) for a, b in zip(nanoseconds, nanoseconds[1:])],
+        ),
+    ]:
+        tracemalloc.start()
+        time_intervals = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del time_intervals
+        seconds = time_call(build)
+        print(f"{name:>28} {size / n:>17.1f} {seconds / n * 1e9:>14.1f}")
+
+
+def main(argv=None):
+    """Parses the command line and runs the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-size", type=int, default=10**2)
+    parser.add_argument("--max-size", type=int, default=10**5)
+    parser.add_argument(
+        "--distribution", action="append", choices=sorted(DISTRIBUTIONS)
+    )
+    parser.add_argument("--operation", action="append", default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print JSON results.")
+    parser.add_argument("--compare", help="a previous --json output to compare with.")
+    parser.add_argument(
+        "--layouts", action="store_true", help="compare Time_Interval layouts."
+    )
+    args = parser.parse_args(argv)
+
+    if args.layouts:
+        benchmark_time_interval()
+        return
+
+    sizes = [n for n in SIZES if args.min_size <= n <= args.max_size]
+    distributions = args.distribution or list(DISTRIBUTIONS)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            for result in json.load(file)["results"]:
+                key = (result["operation"], result["distribution"], result["n"])
+                baseline[key] = result["seconds"]
+
+    results = run(sizes, distributions, args.operation, args.repeat)
+    if args.json:
+        json.dump(
+            {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "numpy": np.__version__,
+                "results": list(results),
+            },
+            sys.stdout,
+            indent=1,
+        )
+        print()
+        return
+
+    print(
+        f"{'operation':>32} {'distribution':>12} {'n':>9} {'seconds':>10} {'ns / interval':>14} {'vs baseline':>12}"
+    )
+    for result in results:
+        key = (result["operation"], result["distribution"], result["n"])
+        ratio = f"{result['seconds'] / baseline[key]:.2f}x" if key in baseline else ""
+        print(
+            f"{result['operation']:>32} {result['distribution']:>12} {result['n']:>9}"
+            f" {result['seconds']:>10.4f} {result['ns_per_interval']:>14.1f} {ratio:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import os
+import tempfile
+import unittest
+import zoneinfo
+import numpy as np
+import pandas as pd
+from Time_Set import Time_Set
+from Time_Set import Time_Interval
+from Time_Set import Array_Time_Set
+
+# Sample time ranges to test with.
+tr1 = Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 9:00")
+tr2 = Time_Interval.from_strings("8/1/2022 8:00", "8/1/2022 10:00")
+tr3 = Time_Interval.from_strings("8/1/2022 9:00", "8/1/2022 11:00")
+tr4 = Time_Interval.from_strings("8/1/2022 10:00", "8/1/2022 12:00")
+tr5 = Time_Interval.from_strings("8/1/2022 10:30", "8/1/2022 11:30")
+tr6 = Time_Interval.from_strings("8/1/2022 10:45", "8/1/2022 11:15")
+tr9 = Time_Interval.from_strings("8/1/2022 11:30", "8/1/2022 13:00")
+tr11 = Time_Interval.from_strings("8/1/2022 6:00", "8/1/2022 11:00")
+tr12 = Time_Interval.from_strings("8/1/2022 6:00", "8/1/2022 12:00")
+
+
+def array_time_set(time_intervals: list) -> Array_Time_Set:
+    """Builds an Array_Time_Set from Time_Intervals, in the given order."""
+    return Array_Time_Set(
+        [i.start for i in time_intervals], [i.end for i in time_intervals]
+    )
+
+
+class Test_Array_Time_Set(unittest.TestCase):
+    def test_init(self):
+        """Tests the constructor sorts and validates."""
+        time_set = array_time_set([tr4, tr1, tr2])
+        self.assertEqual(time_set.starts.dtype, np.dtype("datetime64[ns]"))
+        self.assertEqual(list(time_set), [tr1, tr2, tr4])
+        self.assertEqual(len(array_time_set([])), 0)
+        with self.assertRaises(ValueError):
+            Array_Time_Set([tr2.end], [tr2.start])
+        with self.assertRaises(ValueError):
+            Array_Time_Set([tr2.start], [tr2.start])
+
+    def test_indexing(self):
+        """Tests that elements are built as Time_Intervals on access."""
+        time_set = array_time_set([tr1, tr2, tr4])
+        self.assertEqual(time_set[1], tr2)
+        self.assertEqual(time_set[-1], tr4)
+        self.assertEqual(time_set[1:], array_time_set([tr2, tr4]))
+        self.assertEqual(time_set.time_intervals, [tr1, tr2, tr4])
+
+    def test_equals(self):
+        """Tests the == overriding, including against a Time_Set."""
+        self.assertEqual(array_time_set([tr1, tr2]), array_time_set([tr2, tr1]))
+        self.assertNotEqual(array_time_set([tr1, tr2]), array_time_set([tr1, tr3]))
+        self.assertEqual(array_time_set([tr1, tr2]), Time_Set([tr1, tr2]))
+        self.assertEqual(Time_Set([tr1, tr2]), array_time_set([tr1, tr2]))
+        integers = Time_Set([Time_Interval(0, 10)])
+        self.assertNotEqual(array_time_set([tr1]), integers)
+        self.assertNotIn(array_time_set([tr1]), [integers])
+
+    def test_append(self):
+        """Tests append() returns a new set without changing the original."""
+        time_set = array_time_set([tr1, tr4])
+        self.assertEqual(time_set.append(tr2), Time_Set([tr1, tr2, tr4]))
+        self.assertEqual(time_set.append([tr3, tr2]), Time_Set([tr1, tr2, tr3, tr4]))
+        self.assertEqual(time_set, Time_Set([tr1, tr4]))
+
+    def test_compute_intersection(self):
+        """Tests compute_intersection() matches Time_Set."""
+        for time_intervals in [
+            [tr1, tr2],
+            [tr1, tr3],
+            [tr4, tr5, tr6],
+            [tr1, tr3, tr12],
+        ]:
+            self.assertEqual(
+                array_time_set(time_intervals).compute_intersection(),
+                Time_Set(time_intervals).compute_intersection(),
+            )
+        self.assertIsNone(array_time_set([]).compute_intersection())
+
+    def test_compute_union(self):
+        """Tests compute_union() matches Time_Set."""
+        for time_intervals in [
+            [tr1, tr2],
+            [tr1, tr2, tr4],
+            [tr4, tr5],
+            [tr1, tr4],
+            [tr1, tr2, tr5, tr9],
+            [tr11, tr1, tr9],
+            [],
+        ]:
+            union = array_time_set(time_intervals).compute_union()
+            self.assertIsInstance(union, Array_Time_Set)
+            self.assertTrue(union.is_normalized)
+            self.assertEqual(union, Time_Set(time_intervals).compute_union())
+
+    def test_from_dataframe(self):
+        """Tests that datetime64[ns] columns are wrapped without a copy."""
+        dataframe = array_time_set([tr1, tr2, tr4]).to_dataframe()
+        time_set = Array_Time_Set.from_dataframe(dataframe)
+        self.assertTrue(
+            np.shares_memory(time_set.starts, dataframe["start"].to_numpy())
+        )
+        self.assertEqual(time_set, Time_Set([tr1, tr2, tr4]))
+        strings = pd.DataFrame({"start": ["8/1/2022 7:00"], "end": ["8/1/2022 9:00"]})
+        self.assertEqual(Array_Time_Set.from_dataframe(strings), Time_Set([tr1]))
+
+    def test_save_and_load(self):
+        """Tests save() and load() with and without memory-mapping."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "time_set.bin")
+            Time_Set([tr4, tr1, tr2]).save(path)
+            for mmap in [True, False]:
+                time_set = Time_Set.load(path, mmap=mmap)
+                self.assertIsInstance(time_set, Array_Time_Set)
+                self.assertFalse(time_set.is_normalized)
+                self.assertEqual(time_set, Time_Set([tr1, tr2, tr4]))
+                self.assertTrue(time_set.contains(tr2.start))
+                self.assertEqual(time_set.containing(tr2.start), [tr1, tr2])
+                self.assertIsNone(time_set._time_intervals)
+            del time_set
+
+            union = array_time_set([tr1, tr2, tr4]).compute_union()
+            union.save(path)
+            loaded = Time_Set.load(path)
+            self.assertTrue(loaded.is_normalized)
+            self.assertEqual(loaded, union)
+            # saving a memory-mapped set back to its own file.
+            loaded.save(path)
+            self.assertEqual(Time_Set.load(path), union)
+            del loaded
+
+            with open(path, "wb") as file:
+                file.write(b"not a time set")
+            with self.assertRaises(ValueError):
+                Time_Set.load(path)
+
+    def test_hash(self):
+        """Tests equal sets hash alike whether array-backed or not."""
+        self.assertEqual(hash(array_time_set([tr1, tr2])), hash(Time_Set([tr1, tr2])))
+        # neither hashing nor a cached set operation builds the time intervals.
+        time_set = array_time_set([tr1, tr2])
+        hash(time_set | array_time_set([tr4]))
+        self.assertIsNone(time_set._time_intervals)
+
+    def test_gaps(self):
+        """Tests gaps() stays array-backed."""
+        gaps = array_time_set([tr1, tr4, tr9]).gaps(min_length="30min")
+        self.assertIsInstance(gaps, Array_Time_Set)
+        self.assertEqual(gaps, Time_Set([tr3]) - Time_Set([tr4]))
+
+    def test_timezones(self):
+        """Tests tz-aware arrays are stored as UTC and survive save and load."""
+        starts = pd.DatetimeIndex(["2022-08-01 09:00", "2022-08-01 11:00"]).tz_localize(
+            zoneinfo.ZoneInfo("Europe/Berlin")
+        )
+        time_set = Array_Time_Set(starts, starts + pd.Timedelta(hours=2))
+        self.assertTrue(time_set.is_utc)
+        self.assertEqual(time_set.starts[0], np.datetime64("2022-08-01T07:00", "ns"))
+        self.assertEqual(
+            time_set[0].start.tzinfo, time_set.compute_union()[0].start.tzinfo
+        )
+        self.assertEqual(time_set, Time_Set(list(time_set)))
+        self.assertNotEqual(time_set, Array_Time_Set(time_set.starts, time_set.ends))
+        self.assertEqual(len(time_set.compute_union()), 1)
+        self.assertTrue(time_set[:1].is_utc)
+        with self.assertRaises(TypeError):
+            time_set.append(tr1)
+        with self.assertRaises(ValueError):
+            Array_Time_Set(starts, time_set.ends)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "time_set.bin")
+            time_set.save(path)
+            loaded = Time_Set.load(path)
+            self.assertTrue(loaded.is_utc)
+            self.assertEqual(loaded, time_set)
+            del loaded
+
+    def test_nanoseconds(self):
+        """Tests time intervals shorter than a microsecond keep their times."""
+        starts = np.array(["2022-08-01T00:00:00.000000001"], dtype="datetime64[ns]")
+        time_set = Array_Time_Set(starts, starts + np.timedelta64(1, "ns"))
+        self.assertEqual(time_set[0].time_elapsed, pd.Timedelta(1, "ns"))
+        self.assertEqual(len(str(time_set).splitlines()), 3)
+        self.assertEqual(Time_Set(list(time_set)), time_set)
+        self.assertEqual(hash(Time_Set(list(time_set))), hash(time_set))
+        self.assertEqual(len(time_set | Time_Set([tr1])), 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "time_set.bin")
+            time_set.save(path)
+            loaded = Time_Set.load(path)
+            self.assertEqual(list(loaded), list(time_set))
+            del loaded
+
+    def test_set_operations(self):
+        """Tests the set operators between array-backed sets run on the arrays."""
+        for a, b in [
+            ([tr1, tr2, tr4], [tr3, tr9]),
+            ([tr1, tr4], [tr1, tr4]),
+            ([tr1], []),
+            ([], [tr2]),
+        ]:
+            for operation in ["__or__", "__and__", "__sub__", "__xor__"]:
+                result = getattr(array_time_set(a), operation)(array_time_set(b))
+                self.assertIsInstance(result, Array_Time_Set)
+                self.assertTrue(result.is_normalized)
+                self.assertEqual(result, getattr(Time_Set(a), operation)(Time_Set(b)))
+                self.assertEqual(
+                    getattr(Time_Set(a), operation)(array_time_set(b)), result
+                )
+                # the cached array result is not returned for list-backed sets.
+                self.assertNotIsInstance(
+                    getattr(Time_Set(a), operation)(Time_Set(b)), Array_Time_Set
+                )
+
+    def test_queries(self):
+        """Tests the queries search the arrays and match the list-backed ones."""
+        time_intervals = [tr1, tr2, tr3, tr4, tr9]
+        time_set = array_time_set(time_intervals)
+        for start, end in [
+            (tr1.start, tr1.end),
+            (tr2.start, tr3.end),
+            (tr3.start, tr3.end),
+            (tr9.start, tr9.end),
+            (tr1.start - (tr1.end - tr1.start), tr1.start),
+        ]:
+            for query in ["overlapping", "covering"]:
+                self.assertEqual(
+                    getattr(time_set, query)(start, end),
+                    getattr(Time_Set(time_intervals), query)(start, end),
+                )
+            for query in ["contains", "containing"]:
+                self.assertEqual(
+                    getattr(time_set, query)(start),
+                    getattr(Time_Set(time_intervals), query)(start),
+                )
+        self.assertIsNone(time_set._time_intervals)
+        with self.assertRaises(TypeError):
+            time_set.contains(pd.Timestamp(tr1.start, tz="UTC"))
+        self.assertFalse(array_time_set([]).contains(tr1.start))
@@ -0,0 +1,62 @@
+import unittest
+from Time_Set import Time_Set
+from Time_Set import Time_Interval
+from Time_Set import Incremental_Time_Set
+
+# Sample time ranges to test with.
+tr1 = Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 9:00")
+tr2 = Time_Interval.from_strings("8/1/2022 8:00", "8/1/2022 10:00")
+tr3 = Time_Interval.from_strings("8/1/2022 9:00", "8/1/2022 11:00")
+tr4 = Time_Interval.from_strings("8/1/2022 10:00", "8/1/2022 12:00")
+tr5 = Time_Interval.from_strings("8/1/2022 10:30", "8/1/2022 11:30")
+tr9 = Time_Interval.from_strings("8/1/2022 11:30", "8/1/2022 13:00")
+tr11 = Time_Interval.from_strings("8/1/2022 6:00", "8/1/2022 11:00")
+
+
+class Test_Incremental_Time_Set(unittest.TestCase):
+    def test_add(self):
+        """Tests add() keeps the set merged like compute_union()."""
+        time_set = Incremental_Time_Set()
+        added = []
+        for time_interval in [tr4, tr1, tr9, tr2, tr5, tr11]:
+            time_set.add(time_interval)
+            added.append(time_interval)
+            self.assertEqual(time_set, Time_Set(added).compute_union())
+        self.assertEqual(len(time_set), 1)
+        with self.assertRaises(TypeError):
+            time_set.add("not a time interval")
+
+    def test_add_touching(self):
+        """Tests that time intervals sharing an endpoint are merged."""
+        time_set = Incremental_Time_Set([tr1, tr3])
+        self.assertEqual(time_set, Time_Set([tr1.union(tr3)]))
+
+    def test_remove(self):
+        """Tests remove() subtracts time like Time_Set subtraction."""
+        time_set = Incremental_Time_Set([tr1, tr4])
+        time_set.remove(tr5)
+        self.assertEqual(time_set, Time_Set([tr1, tr4]) - Time_Set([tr5]))
+        time_set.remove(tr11)
+        self.assertEqual(time_set, Time_Set([tr4]) - Time_Set([tr5, tr11]))
+        time_set.remove(tr9)
+        self.assertEqual(time_set, Time_Set([]))
+
+    def test_queries_see_changes(self):
+        """Tests that the index and union follow add() and remove()."""
+        time_set = Incremental_Time_Set([tr1])
+        self.assertFalse(time_set.contains(tr4.start))
+        union = time_set.compute_union()
+        time_set.add(tr4)
+        self.assertTrue(time_set.contains(tr4.start))
+        self.assertEqual(union, Time_Set([tr1]))
+        self.assertEqual(time_set.compute_union(), Time_Set([tr1, tr4]))
+
+    def test_not_hashable(self):
+        """Tests that a set changed in place cannot be hashed or cached."""
+        time_set = Incremental_Time_Set([tr1])
+        with self.assertRaises(TypeError):
+            hash(time_set)
+        self.assertEqual(time_set | Time_Set([tr4]), Time_Set([tr1, tr4]))
+        self.assertEqual(time_set.total_duration(), tr1.time_elapsed)
+        time_set.add(tr4)
+        self.assertEqual(time_set.total_duration(), tr1.time_elapsed + tr4.time_elapsed)
@@ -1,5 +1,6 @@
 import unittest
 import datetime
+import zoneinfo
 from Time_Set import Time_Set
 from Time_Set import Time_Interval
 
@@ -125,3 +126,99 @@ class Test_Time_Interval(unittest.TestCase):
         self.assertEqual(tr4.union(tr5), tr4)
         # Disjoint, so they form a Time Set
         self.assertEqual(tr1.union(tr4), Time_Set([tr1, tr4]))
+
+    def test_compact_storage(self):
+        """Tests __slots__, the lazy time_elapsed and integer timestamps."""
+        self.assertFalse(hasattr(tr1, "__dict__"))
+        self.assertEqual(tr1.time_elapsed, datetime.timedelta(hours=2))
+        nanoseconds = Time_Interval(0, 3_600_000_000_000)
+        self.assertEqual(nanoseconds.time_elapsed, 3_600_000_000_000)
+        self.assertEqual(
+            nanoseconds.union(Time_Interval(1, 2)), Time_Interval(0, 3_600_000_000_000)
+        )
+        with self.assertRaises(ValueError):
+            Time_Interval(5, 5)
+        integers = Time_Set([Time_Interval(0, 10), Time_Interval(5, 20)])
+        self.assertEqual(integers.compute_union(), Time_Set([Time_Interval(0, 20)]))
+        self.assertEqual(
+            integers | Time_Interval(30, 40),
+            Time_Set([Time_Interval(0, 20), Time_Interval(30, 40)]),
+        )
+        with self.assertRaises(TypeError):
+            integers.total_duration()
+        with self.assertRaises(TypeError):
+            integers.coverage()
+
+    def test_from_string_pairs(self):
+        """Tests bulk parsing with the default, ISO-8601 and other formats."""
+        self.assertEqual(
+            Time_Interval.from_string_pairs(
+                ["8/1/2022 7:00", "8/1/2022 10:00"], ["8/1/2022 9:00", "8/1/2022 12:00"]
+            ),
+            [tr1, tr4],
+        )
+        self.assertEqual(
+            Time_Interval.from_string_pairs(
+                ["2022-08-01T07:00:00"], ["2022-08-01T09:00:00"], "%Y-%m-%dT%H:%M:%S"
+            ),
+            [tr1],
+        )
+        self.assertEqual(
+            Time_Interval.from_string_pairs(
+                ["Aug 1 2022 7AM"], ["Aug 1 2022 9AM"], "%b %d %Y %I%p"
+            ),
+            [tr1],
+        )
+        # strings the fast parsers reject still raise like strptime.
+        with self.assertRaises(ValueError):
+            Time_Interval.from_string_pairs(["13/1/2022 7:00"], ["8/1/2022 9:00"])
+        with self.assertRaises(ValueError):
+            Time_Interval.from_string_pairs(
+                ["2022-08-01T07:00:00+01:00"],
+                ["2022-08-01T09:00:00"],
+                "%Y-%m-%dT%H:%M:%S",
+            )
+        with self.assertRaises(ValueError):
+            Time_Interval.from_string_pairs(["8/1/2022 7:00"], [])
+
+    def test_timezones(self):
+        """Tests tz-aware times are held in UTC and measured across DST."""
+        new_york = zoneinfo.ZoneInfo("America/New_York")
+        # 2022-11-06 is the end of daylight saving time in New York.
+        night = Time_Interval(
+            datetime.datetime(2022, 11, 6, 0, 0, tzinfo=new_york),
+            datetime.datetime(2022, 11, 6, 3, 0, tzinfo=new_york),
+        )
+        self.assertEqual(night.time_elapsed, datetime.timedelta(hours=4))
+        self.assertIs(night.start.tzinfo, datetime.timezone.utc)
+        self.assertEqual(night.astimezone(new_york)[1].hour, 3)
+        # 1:30 happens twice that night; the second (fold=1) is an hour later.
+        first, second = (
+            datetime.datetime(2022, 11, 6, 1, 30, fold=fold, tzinfo=new_york)
+            for fold in (0, 1)
+        )
+        self.assertEqual(
+            Time_Interval(first, second).time_elapsed, datetime.timedelta(hours=1)
+        )
+        with self.assertRaises(ValueError):
+            Time_Interval(second, first)
+        with self.assertRaises(TypeError):
+            Time_Interval(first, datetime.datetime(2022, 11, 6, 3))
+        # the same time recorded in another zone is the same time interval.
+        self.assertEqual(
+            night,
+            Time_Interval(
+                datetime.datetime(
+                    2022, 11, 6, 4, 0, tzinfo=zoneinfo.ZoneInfo("Europe/London")
+                ),
+                datetime.datetime(2022, 11, 6, 8, 0, tzinfo=datetime.timezone.utc),
+            ),
+        )
+        self.assertEqual(
+            Time_Interval.from_strings(
+                "2022-08-01T09:00:00+02:00",
+                "2022-08-01T09:00:00+00:00",
+                "%Y-%m-%dT%H:%M:%S%z",
+            ).time_elapsed,
+            datetime.timedelta(hours=2),
+        )
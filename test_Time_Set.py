@@ -1,6 +1,26 @@
+import asyncio
+import datetime
+import os
+import tempfile
 import unittest
+import warnings
+import zoneinfo
+import numpy as np
+import pandas as pd
+import Time_Set as Time_Set_module
 from Time_Set import Time_Set
 from Time_Set import Time_Interval
+from Time_Set import aiter_union
+from Time_Set import aload_union
+from Time_Set import clear_cache
+from Time_Set import disable_profiling
+from Time_Set import enable_profiling
+from Time_Set import get_profile
+from Time_Set import reset_profile
+from Time_Set import iter_common_time
+from Time_Set import iter_intersection
+from Time_Set import iter_union
+from Time_Set import merge_streams
 
 # Sample time ranges to test with.
 tr1 = Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 9:00")
@@ -93,3 +113,540 @@ class Test_Time_Set(unittest.TestCase):
                 [Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 10:00"), tr5]
             ),
         )
+
+    def test_compute_union_is_normalized(self):
+        """Tests that compute_union() flags its result and does not redo work."""
+        self.assertEqual(Time_Set([]).compute_union(), Time_Set([]))
+        union = Time_Set([tr1, tr2, tr5, tr9]).compute_union()
+        self.assertTrue(union.is_normalized)
+        self.assertFalse(Time_Set([tr1, tr2]).is_normalized)
+        self.assertIs(union.compute_union(), union)
+        self.assertEqual(
+            union,
+            Time_Set(
+                [
+                    Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 10:00"),
+                    Time_Interval.from_strings("8/1/2022 10:30", "8/1/2022 13:00"),
+                ]
+            ),
+        )
+        # the original time intervals are never mutated.
+        self.assertEqual(
+            tr1, Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 9:00")
+        )
+
+    def test_from_dataframe(self):
+        """Tests from_dataframe() with string and datetime columns."""
+        dataframe = pd.DataFrame(
+            {
+                "in": ["8/1/2022 8:00", "8/1/2022 7:00"],
+                "out": ["8/1/2022 10:00", "8/1/2022 9:00"],
+            }
+        )
+        time_set = Time_Set.from_dataframe(dataframe, "in", "out", "%m/%d/%Y %H:%M")
+        self.assertEqual(time_set, Time_Set([tr1, tr2]))
+        self.assertEqual(Time_Set.from_dataframe(time_set.to_dataframe()), time_set)
+
+    def test_from_dataframe_bad_rows(self):
+        """Tests that every bad row is reported at once, or dropped."""
+        dataframe = pd.DataFrame(
+            {
+                "start": ["8/1/2022 7:00", "not a time", "8/1/2022 9:00", None],
+                "end": [
+                    "8/1/2022 9:00",
+                    "8/1/2022 9:00",
+                    "8/1/2022 8:00",
+                    "8/1/2022 9:00",
+                ],
+            }
+        )
+        with self.assertRaisesRegex(ValueError, r"\[1, 2, 3\]"):
+            Time_Set.from_dataframe(dataframe, time_format="%m/%d/%Y %H:%M")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            time_set = Time_Set.from_dataframe(
+                dataframe, time_format="%m/%d/%Y %H:%M", errors="drop"
+            )
+        self.assertEqual(time_set, Time_Set([tr1]))
+        self.assertEqual(len(caught), 1)
+
+    def test_set_operators(self):
+        """Tests |, &, - and ^ between Time_Sets."""
+        a = Time_Set([tr1, tr5])  # 7:00-9:00, 10:30-11:30
+        b = Time_Set([tr2, tr6])  # 8:00-10:00, 10:45-11:15
+        self.assertEqual(
+            a | b,
+            Time_Set(
+                [
+                    Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 10:00"),
+                    tr5,
+                ]
+            ),
+        )
+        self.assertEqual(a & b, Time_Set([tr10, tr6]))
+        self.assertEqual(
+            a - b,
+            Time_Set(
+                [
+                    Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 8:00"),
+                    Time_Interval.from_strings("8/1/2022 10:30", "8/1/2022 10:45"),
+                    Time_Interval.from_strings("8/1/2022 11:15", "8/1/2022 11:30"),
+                ]
+            ),
+        )
+        self.assertEqual(
+            a ^ b,
+            Time_Set(
+                [
+                    Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 8:00"),
+                    Time_Interval.from_strings("8/1/2022 9:00", "8/1/2022 10:00"),
+                    Time_Interval.from_strings("8/1/2022 10:30", "8/1/2022 10:45"),
+                    Time_Interval.from_strings("8/1/2022 11:15", "8/1/2022 11:30"),
+                ]
+            ),
+        )
+        self.assertTrue((a ^ b).is_normalized)
+        # sets that only share an endpoint.
+        self.assertEqual(
+            Time_Set([tr1]) | Time_Set([tr3]), Time_Set([tr1]) ^ Time_Set([tr3])
+        )
+        self.assertEqual(Time_Set([tr1]) & Time_Set([tr3]), Time_Set([]))
+        self.assertEqual(Time_Set([tr1]) - Time_Set([]), Time_Set([tr1]))
+        self.assertEqual(Time_Set([tr4]) - tr5, tr4 - tr5)
+
+    def test_queries(self):
+        """Tests contains(), containing(), overlapping() and covering()."""
+        time_set = Time_Set([tr1, tr2, tr4, tr5, tr9])
+        nine = tr3.start
+        self.assertTrue(time_set.contains(nine))
+        self.assertFalse(time_set.contains(tr1.start - (tr1.end - tr1.start)))
+        self.assertFalse(Time_Set([tr1, tr4]).contains(tr1.end))
+        self.assertEqual(time_set.containing(nine), [tr2])
+        self.assertEqual(time_set.containing(tr5.start), [tr4, tr5])
+        self.assertEqual(time_set.overlapping(tr13.start, tr13.end), [tr2])
+        self.assertEqual(time_set.overlapping(tr6.start, tr6.end), [tr4, tr5])
+        self.assertEqual(time_set.covering(tr10.start, tr10.end), [tr1, tr2])
+        self.assertEqual(time_set.covering(tr1.start, tr2.end), [])
+
+    def test_append_does_not_change_original(self):
+        """Tests that append() returns a new Time_Set with its own index."""
+        time_set = Time_Set([tr1])
+        self.assertFalse(time_set.contains(tr4.start))
+        appended = time_set.append(tr4)
+        self.assertTrue(appended.contains(tr4.start))
+        self.assertFalse(time_set.contains(tr4.start))
+        self.assertEqual(time_set, Time_Set([tr1]))
+
+    def test_contains_many(self):
+        """Tests contains_many() with the left-closed, right-open boundaries."""
+        time_set = Time_Set([tr1, tr2, tr9])  # 7:00-10:00, 11:30-13:00
+        times = [tr1.start, tr2.end, tr4.start, tr9.start, tr9.end, tr3.end]
+        expected = [True, False, False, True, False, False]
+        self.assertEqual(list(time_set.contains_many(times)), expected)
+        self.assertEqual(list(time_set.contains_many(pd.Series(times))), expected)
+        inside, index = time_set.contains_many(
+            np.array(times, dtype="datetime64[ns]"), return_index=True
+        )
+        self.assertEqual(list(inside), expected)
+        self.assertEqual(list(index), [0, -1, -1, 1, -1, -1])
+        self.assertEqual(list(Time_Set([]).contains_many(times)), [False] * 6)
+
+    def test_streams(self):
+        """Tests the streaming unions, intersections and merge_streams()."""
+        a = iter([tr1, tr4, tr9])
+        b = iter([(tr2.start, tr2.end), (tr6.start, tr6.end)])
+        self.assertEqual(list(merge_streams([tr1, tr4], [tr2])), [tr1, tr2, tr4])
+        self.assertEqual(
+            list(iter_union(a, b)),
+            Time_Set([tr1, tr2, tr4, tr6, tr9]).compute_union().time_intervals,
+        )
+        for time_intervals in [[tr1, tr2], [tr1, tr2, tr13], [tr1, tr4], [tr1], []]:
+            intersection = Time_Set(time_intervals).compute_intersection()
+            self.assertEqual(
+                list(iter_intersection(iter(time_intervals))),
+                [] if intersection is None else [intersection],
+            )
+        self.assertEqual(list(iter_intersection([tr1], [tr2, tr10])), [tr10])
+        # an empty intersection stops reading the streams.
+        stream = iter([tr1, tr4, tr9])
+        self.assertEqual(list(iter_intersection(stream)), [])
+        self.assertEqual(list(stream), [tr9])
+        with self.assertRaises(ValueError):
+            list(iter_intersection([tr2, tr1]))
+
+        self.assertEqual(list(iter_common_time([tr1, tr4], [tr2, tr6])), [tr10, tr6])
+        self.assertEqual(list(iter_common_time([tr1], [tr3])), [])
+        with self.assertRaises(ValueError):
+            list(iter_common_time([tr1]))
+        self.assertEqual(list(iter_union()), [])
+        with self.assertRaises(ValueError):
+            list(iter_union([tr4, tr1]))
+
+    def test_compute_union_workers(self):
+        """Tests the parallel compute_union() matches the serial one."""
+        time_intervals = [tr1, tr2, tr3, tr4, tr5, tr6, tr7, tr8, tr9, tr13]
+        # chunks split between time intervals that only share an endpoint.
+        for time_set in [
+            Time_Set(time_intervals),
+            Time_Set([tr1, tr3, tr9]),
+            Time_Set([]),
+        ]:
+            self.assertEqual(
+                time_set.compute_union(workers=3), time_set.compute_union()
+            )
+        # the same time objects come back, whatever their type.
+        timestamps = Time_Set(
+            [
+                Time_Interval(pd.Timestamp(i.start), pd.Timestamp(i.end))
+                for i in time_intervals
+            ]
+        )
+        for serial, parallel in zip(
+            timestamps.compute_union(), timestamps.compute_union(workers=3)
+        ):
+            self.assertIs(type(parallel.start), type(serial.start))
+            self.assertIs(type(parallel.end), type(serial.end))
+            self.assertEqual(parallel, serial)
+        with self.assertRaises(TypeError):
+            Time_Set([Time_Interval(0, 10), Time_Interval(5, 20)]).compute_union(
+                workers=2
+            )
+
+    def test_append(self):
+        """Tests append() with single time intervals, lists and bad inputs."""
+        time_set = Time_Set([tr4, tr1])
+        self.assertEqual(time_set.append(tr2), Time_Set([tr1, tr2, tr4]))
+        self.assertEqual(time_set.append([tr9, tr3]), Time_Set([tr1, tr3, tr4, tr9]))
+        self.assertEqual(time_set, Time_Set([tr1, tr4]))
+        with self.assertRaises(TypeError):
+            time_set.append([tr2, "not a time interval"])
+
+    def test_from_string_pairs(self):
+        """Tests from_string_pairs() builds a sorted Time_Set."""
+        self.assertEqual(
+            Time_Set.from_string_pairs(
+                ["8/1/2022 10:00", "8/1/2022 7:00"], ["8/1/2022 12:00", "8/1/2022 9:00"]
+            ),
+            Time_Set([tr1, tr4]),
+        )
+
+    def test_coverage(self):
+        """Tests coverage() and rolling_coverage() per bucket."""
+        time_set = Time_Set([tr1, tr2, tr5])  # 7:00-10:00, 10:30-11:30
+        hours = [pd.Timedelta(minutes=m) for m in [60, 60, 60, 30, 30]]
+        self.assertEqual(list(time_set.coverage("1h")), hours)
+        self.assertEqual(time_set.coverage("1h").index[0], pd.Timestamp(tr1.start))
+        self.assertEqual(list(time_set.coverage("D")), [pd.Timedelta(hours=4)])
+        self.assertEqual(
+            list(time_set.coverage("30min", start=tr13.start, end=tr4.end)),
+            [pd.Timedelta(minutes=m) for m in [30, 30, 0, 30, 30, 0]],
+        )
+        self.assertEqual(list(time_set.rolling_coverage("1h", "1h")), hours)
+        self.assertEqual(
+            list(time_set.rolling_coverage("2h", "1h")),
+            [pd.Timedelta(minutes=m) for m in [60, 120, 120, 90, 60]],
+        )
+        self.assertEqual(
+            list(Time_Set([]).coverage("1h", start=tr1.start, end=tr1.end)),
+            [pd.Timedelta(0)] * 2,
+        )
+
+    def test_depth_profile(self):
+        """Tests depth_profile() and intervals_with_depth()."""
+        time_set = Time_Set([tr1, tr2, tr3, tr11])
+        breakpoints, counts = time_set.depth_profile()
+        self.assertEqual(
+            list(pd.DatetimeIndex(breakpoints)),
+            [
+                pd.Timestamp(t)
+                for t in [tr11.start, tr1.start, tr2.start, tr2.end, tr3.end]
+            ],
+        )
+        # tr1 ends as tr3 starts, so 9:00 is not a breakpoint.
+        self.assertEqual(list(counts), [1, 2, 3, 2, 0])
+        self.assertEqual(
+            time_set.intervals_with_depth(3),
+            Time_Set([Time_Interval.from_strings("8/1/2022 8:00", "8/1/2022 10:00")]),
+        )
+        self.assertEqual(time_set.intervals_with_depth(1), time_set.compute_union())
+        self.assertEqual(time_set.intervals_with_depth(4), Time_Set([]))
+        with self.assertRaises(ValueError):
+            time_set.intervals_with_depth(0)
+        self.assertEqual(len(Time_Set([]).depth_profile()[0]), 0)
+
+    def test_group_operations(self):
+        """Tests group_union() and group_intersection() match per-group results."""
+        groups = {"a": [tr1, tr2, tr9], "b": [tr4, tr5, tr6], "c": [tr1, tr3]}
+        dataframe = pd.concat(
+            [
+                Time_Set(time_intervals).to_dataframe().assign(entity_id=key)
+                for key, time_intervals in groups.items()
+            ]
+        ).sample(frac=1, random_state=0)
+
+        unions = Time_Set.group_union(dataframe, by="entity_id")
+        intersections = Time_Set.group_intersection(dataframe, by="entity_id")
+        self.assertEqual(sorted(unions), ["a", "b", "c"])
+        for key, time_intervals in groups.items():
+            self.assertEqual(unions[key], Time_Set(time_intervals).compute_union())
+            self.assertEqual(
+                intersections[key], Time_Set(time_intervals).compute_intersection()
+            )
+        self.assertEqual(Time_Set.group_union(dataframe.iloc[:0], by="entity_id"), {})
+        # naive local times are converted to UTC, across the end of DST.
+        local = pd.DataFrame(
+            {
+                "entity_id": ["a", "a"],
+                "start": ["2022-10-30 00:00", "2022-10-30 01:00"],
+                "end": ["2022-10-30 01:00", "2022-10-30 04:00"],
+            }
+        )
+        union = Time_Set.group_union(local, by="entity_id", tz="Europe/Berlin")["a"]
+        self.assertTrue(union.is_utc)
+        self.assertEqual(union.total_duration(), datetime.timedelta(hours=5))
+        intersection = Time_Set.group_intersection(
+            local.iloc[1:], by="entity_id", tz="Europe/Berlin"
+        )["a"]
+        self.assertEqual(intersection.time_elapsed, datetime.timedelta(hours=4))
+
+    def test_aiter_union(self):
+        """Tests aiter_union() over files and an async producer together."""
+
+        async def producer():
+            for time_interval in [tr5, (tr9.start, tr9.end)]:
+                await asyncio.sleep(0)
+                yield time_interval
+
+        async def collect(*sources):
+            return [i async for i in aiter_union(*sources, chunk_size=1)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "intervals.csv")
+            json_path = os.path.join(directory, "intervals.jsonl")
+            Time_Set([tr1, tr4]).to_dataframe().to_csv(csv_path, index=False)
+            Time_Set([tr2, tr6]).to_dataframe().astype(str).to_json(
+                json_path, orient="records", lines=True
+            )
+
+            merged = asyncio.run(collect(csv_path, json_path, producer()))
+            self.assertEqual(
+                merged,
+                Time_Set([tr1, tr2, tr4, tr5, tr6, tr9]).compute_union().time_intervals,
+            )
+            self.assertEqual(
+                asyncio.run(aload_union(csv_path)), Time_Set([tr1, tr4]).compute_union()
+            )
+            # an ordinary JSON file holds one array of records.
+            array_path = os.path.join(directory, "intervals.json")
+            Time_Set([tr3, tr9]).to_dataframe().astype(str).to_json(
+                array_path, orient="records"
+            )
+            self.assertEqual(
+                asyncio.run(collect(array_path)),
+                Time_Set([tr3, tr9]).compute_union().time_intervals,
+            )
+        self.assertEqual(asyncio.run(collect()), [])
+
+    def test_profiling(self):
+        """Tests that profiling records calls only while it is enabled."""
+        original = Time_Set.__dict__["compute_union"]
+        reset_profile()
+        enable_profiling()
+        try:
+            Time_Set([tr1, tr2, tr4]).compute_union()
+            tr1 - tr2
+            Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 9:00")
+        finally:
+            disable_profiling()
+        Time_Set([tr1]).compute_union()
+
+        profile = get_profile()
+        self.assertEqual(profile["Time_Set.compute_union"]["calls"], 1)
+        self.assertEqual(profile["Time_Set.compute_union"]["intervals"], 3)
+        self.assertEqual(profile["Time_Interval.__sub__"]["intervals"], 2)
+        self.assertEqual(profile["Time_Interval.from_strings"]["intervals"], 1)
+        self.assertGreaterEqual(profile["Time_Set.compute_union"]["seconds"], 0)
+        self.assertIs(Time_Set.__dict__["compute_union"], original)
+        reset_profile()
+        self.assertEqual(get_profile(), {})
+
+    def test_immutable_value(self):
+        """Tests hashing and the cached derived results."""
+        time_set = Time_Set([tr1, tr2, tr5])
+        self.assertEqual(hash(time_set), hash(Time_Set([tr5, tr2, tr1])))
+        self.assertEqual(len({time_set, Time_Set([tr1, tr2, tr5])}), 1)
+        # comparing with other types is simply unequal.
+        self.assertNotEqual(time_set, 5)
+        self.assertNotEqual(tr1, None)
+        self.assertIn(tr1, [None, tr1])
+        self.assertIn(time_set, [None, time_set])
+        self.assertIs(time_set.compute_union(), time_set.compute_union())
+        self.assertIs(str(time_set), str(time_set))
+        self.assertEqual(time_set.total_duration(), datetime.timedelta(hours=4))
+        self.assertEqual(
+            time_set.bounding_interval(),
+            Time_Interval.from_strings("8/1/2022 7:00", "8/1/2022 11:30"),
+        )
+        self.assertIsNone(Time_Set([]).bounding_interval())
+        self.assertEqual(Time_Set([]).total_duration(), datetime.timedelta(0))
+        # results between equal values are shared through the LRU cache.
+        self.assertIs(
+            time_set | Time_Set([tr9]), Time_Set([tr1, tr2, tr5]) | Time_Set([tr9])
+        )
+        cached = time_set | Time_Set([tr9])
+        clear_cache()
+        self.assertIsNot(time_set | Time_Set([tr9]), cached)
+        # the cache holds at most SET_OPERATION_CACHE_INTERVALS time intervals.
+        limit = Time_Set_module.SET_OPERATION_CACHE_INTERVALS
+        try:
+            Time_Set_module.SET_OPERATION_CACHE_INTERVALS = 5
+            clear_cache()
+            self.assertIsNot(time_set | Time_Set([tr9]), time_set | Time_Set([tr9]))
+            first = Time_Set([tr1]) | Time_Set([tr4])
+            self.assertIs(Time_Set([tr1]) | Time_Set([tr4]), first)
+            Time_Set([tr2]) | Time_Set([tr9])
+            self.assertIsNot(Time_Set([tr1]) | Time_Set([tr4]), first)
+        finally:
+            Time_Set_module.SET_OPERATION_CACHE_INTERVALS = limit
+            clear_cache()
+
+    def test_gaps_and_complement(self):
+        """Tests gaps() and complement() against subtraction."""
+        time_set = Time_Set([tr1, tr5, tr7, tr9])  # 7-9, 10:15-10:45, 10:30-13
+        self.assertEqual(
+            time_set.gaps(),
+            Time_Set(
+                [
+                    Time_Interval.from_strings("8/1/2022 9:00", "8/1/2022 10:15"),
+                ]
+            ),
+        )
+        self.assertEqual(time_set.gaps(min_length="2h"), Time_Set([]))
+        self.assertEqual(Time_Set([tr1, tr3]).gaps(), Time_Set([]))
+        for within in [tr11, tr12, tr4, tr10]:
+            self.assertEqual(time_set.complement(within), Time_Set([within]) - time_set)
+        self.assertEqual(Time_Set([]).complement(tr1), Time_Set([tr1]))
+        self.assertEqual(
+            Time_Set([tr1]).complement(tr11, min_length=datetime.timedelta(hours=2)),
+            Time_Set([Time_Interval.from_strings("8/1/2022 9:00", "8/1/2022 11:00")]),
+        )
+
+    def test_timezones(self):
+        """Tests tz-aware ingest, merging across zones and rendering in a zone."""
+        utc = datetime.timezone.utc
+        berlin = zoneinfo.ZoneInfo("Europe/Berlin")
+        # 9:00 to 11:00 in Berlin is 7:00 to 9:00 UTC, touching 9:00 to 10:00 UTC.
+        time_set = Time_Set(
+            [
+                Time_Interval(
+                    datetime.datetime(2022, 8, 1, 9, tzinfo=berlin),
+                    datetime.datetime(2022, 8, 1, 11, tzinfo=berlin),
+                ),
+                Time_Interval(
+                    datetime.datetime(2022, 8, 1, 9, tzinfo=utc),
+                    datetime.datetime(2022, 8, 1, 10, tzinfo=utc),
+                ),
+            ]
+        )
+        self.assertTrue(time_set.is_utc)
+        self.assertFalse(Time_Set([tr1]).is_utc)
+        union = time_set.compute_union()
+        self.assertEqual(
+            union,
+            Time_Set(
+                [
+                    Time_Interval(
+                        datetime.datetime(2022, 8, 1, 7, tzinfo=utc),
+                        datetime.datetime(2022, 8, 1, 10, tzinfo=utc),
+                    )
+                ]
+            ),
+        )
+        self.assertEqual(union.compute_union(workers=2), union)
+        self.assertEqual(
+            list(time_set.to_dataframe(tz=berlin)["start"].dt.hour), [9, 11]
+        )
+        self.assertEqual(str(time_set.to_dataframe()["end"].dt.tz), "UTC")
+        self.assertEqual(
+            list(time_set.contains_many(pd.to_datetime(["2022-08-01 09:30+02:00"]))),
+            [True],
+        )
+        with self.assertRaises(TypeError):
+            time_set.contains_many([tr1.start])
+        with self.assertRaises(ValueError):
+            Time_Set([tr1]).to_dataframe(tz=berlin)
+
+        # naive local times are localized in bulk; the ambiguous one is dropped.
+        dataframe = pd.DataFrame(
+            {
+                "start": ["2022-10-30 01:00", "2022-10-30 02:30"],
+                "end": ["2022-10-30 04:00", "2022-10-30 05:00"],
+            }
+        )
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            local = Time_Set.from_dataframe(
+                dataframe, tz="Europe/Berlin", errors="drop"
+            )
+        self.assertEqual(len(local), 1)
+        self.assertEqual(local[0].time_elapsed, datetime.timedelta(hours=4))
+        self.assertEqual(
+            Time_Set.from_string_pairs(
+                ["10/30/2022 01:00"], ["10/30/2022 04:00"], tz="Europe/Berlin"
+            ),
+            local,
+        )
+        # offsets in the strings themselves, even mixed, are converted too.
+        mixed = Time_Set.from_dataframe(
+            pd.DataFrame(
+                {
+                    "start": ["2022-08-01T09:00+02:00", "2022-08-01T09:00+00:00"],
+                    "end": ["2022-08-01T11:00+02:00", "2022-08-01T10:00+00:00"],
+                }
+            )
+        )
+        self.assertEqual(mixed, time_set)
+
+        # buckets follow the local calendar, so the day DST ends has 25 hours.
+        day = Time_Set(
+            [
+                Time_Interval(
+                    datetime.datetime(2022, 10, 30, tzinfo=berlin),
+                    datetime.datetime(2022, 10, 31, tzinfo=berlin),
+                )
+            ]
+        )
+        coverage = day.coverage("D", tz=berlin)
+        self.assertEqual(list(coverage), [pd.Timedelta(hours=25)])
+        self.assertEqual(coverage.index[0], pd.Timestamp("2022-10-30", tz=berlin))
+        self.assertEqual(len(day.coverage("1h")), 25)
+        # a start in the repeated hour floors within that hour, not to midnight.
+        fold = Time_Set(
+            [
+                Time_Interval(
+                    datetime.datetime(2022, 10, 30, 0, 30, tzinfo=utc),
+                    datetime.datetime(2022, 10, 30, 2, tzinfo=utc),
+                )
+            ]
+        )
+        coverage = fold.coverage("1h", tz="Europe/Berlin")
+        self.assertEqual(list(coverage), [pd.Timedelta(minutes=m) for m in [30, 60]])
+        self.assertEqual(
+            coverage.index[0], pd.Timestamp("2022-10-30 00:00Z").tz_convert(berlin)
+        )
+        self.assertEqual(
+            day.complement(
+                Time_Interval(
+                    datetime.datetime(2022, 10, 29, 23, tzinfo=utc),
+                    datetime.datetime(2022, 10, 31, tzinfo=utc),
+                )
+            ),
+            Time_Set(
+                [
+                    Time_Interval(
+                        datetime.datetime(2022, 10, 30, 23, tzinfo=utc),
+                        datetime.datetime(2022, 10, 31, tzinfo=utc),
+                    )
+                ]
+            ),
+        )